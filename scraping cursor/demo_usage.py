@@ -3,6 +3,7 @@
 Demo script showing how to use the Tunisia Business Scraper programmatically
 """
 
+import logging
 from tunisia_business_scraper import TunisiaBusinessScraper
 
 def demo():
@@ -45,6 +46,8 @@ def demo():
         print("No businesses found in Sfax")
 
 if __name__ == "__main__":
+    # Scraper progress is logged; print it in line with this script's own output
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     demo()
 
 
@@ -5,9 +5,19 @@ Scrapes directly from Google Maps to get HUNDREDS of real results
 """
 
 import pandas as pd
+import numpy as np
+import requests
 import time
 import json
+import os
+import hashlib
+import functools
+import types
+import queue
+import atexit
+import threading
 from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,184 +26,823 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, ElementClickInterceptedException
 import re
-from urllib.parse import quote
+from urllib.parse import quote_plus
+from scraper_utils import write_csv
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None  # optional, pandas writes the Parquet file when pyarrow is missing
+
+
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Lean Chrome profile: less memory per browser in the pool and faster start-up
+_CHROME_FLAGS = (
+    '--no-sandbox',
+    '--no-zygote',
+    '--disable-dev-shm-usage',
+    '--disable-gpu',
+    '--disable-software-rasterizer',
+    '--disable-blink-features=AutomationControlled',
+    '--blink-settings=imagesEnabled=false',
+    '--disable-features=AudioServiceOutOfProcess,Translate,TranslateUI,BlinkGenPropertyTrees',
+    '--disable-extensions',
+    '--disable-background-networking',
+    # Search tabs load in the background, they must not be throttled
+    '--disable-renderer-backgrounding',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--incognito',
+    '--disk-cache-size=1',
+    '--window-size=1280,900',
+    '--hide-scrollbars',
+    '--mute-audio'
+)
+
+# Resources the scraper never reads: images, fonts and trackers
+_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf',
+    '*googletagmanager*', '*google-analytics*', '*doubleclick*'
+]
+
+# Field validation patterns used for every extracted business
+_PHONE_RE = re.compile(r'[+]?[0-9\s\-()]+')
+_RATING_RE = re.compile(r'\d+\.\d+')
+
+# CSS selectors tried in order for each field of the business details panel
+_FIELD_SELECTORS = {
+    'name': [
+        'h1[data-attrid="title"]',
+        'h1',
+        '[data-attrid="title"]',
+        '.x3AX1-LfntMc-header-title-title',
+        '.SPZz6b h1'
+    ],
+    'address': [
+        '[data-item-id="address"]',
+        '.Io6YTe',
+        '.LrzXr',
+        '[data-attrid="kc:/location/location:address"]'
+    ],
+    'phone': [
+        '[data-item-id*="phone"]',
+        '[data-attrid="kc:/business/phone:phone"]',
+        '.Io6YTe[data-value*="+"]'
+    ],
+    'website': [
+        '[data-item-id*="website"]',
+        '[data-attrid="kc:/business/website:website"]',
+        'a[href*="http"]'
+    ],
+    'rating': [
+        '.ceNzKf',
+        '.MW4etd',
+        '[data-attrid="kc:/business/rating:rating"]'
+    ],
+    'reviews_count': [
+        '.UY7F9',
+        '.HHrUdb',
+        '[data-attrid="kc:/business/rating:review_count"]'
+    ]
+}
+
+# Returns, for each field, the text (or link for the website) of the first
+# element matching each selector, or null when nothing matches
+_EXTRACT_FIELDS_JS = """
+const result = {};
+for (const [field, selectors] of Object.entries(arguments[0])) {
+    result[field] = selectors.map(selector => {
+        const element = document.querySelector(selector);
+        if (!element) return null;
+        return field === 'website' ? (element.href || null) : element.innerText;
+    });
+}
+return result;
+"""
+
+# Search results embedded in the page as JSON
+_APP_STATE_RE = re.compile(r';window\.APP_INITIALIZATION_STATE=(\[.*?\]);window\.', re.S)
+
+
+def _dig(data, *path):
+    """Follow a path of list indexes into Google's nested arrays, None if it does not exist"""
+    for index in path:
+        try:
+            data = data[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+
+# Tunisian cities with coordinates, shared read-only by every scraper
+_TUNISIA_CITIES = types.MappingProxyType({
+    'Tunis': (36.8065, 10.1815),
+    'Sfax': (34.7406, 10.7603),
+    'Sousse': (35.8256, 10.6411),
+    'Kairouan': (35.6781, 10.0963),
+    'Bizerte': (37.2744, 9.8739),
+    'Gabès': (33.8881, 10.0972),
+    'Ariana': (36.8601, 10.1931),
+    'Ben Arous': (36.7531, 10.2189),
+    'Manouba': (36.8081, 10.0972),
+    'Nabeul': (36.4561, 10.7376),
+    'Monastir': (35.7781, 10.8262),
+    'Mahdia': (35.5047, 11.0442),
+    'Kasserine': (35.1678, 8.8361),
+    'Sidi Bouzid': (35.0381, 9.4847),
+    'Kef': (36.1822, 8.7147),
+    'Jendouba': (36.5011, 8.7803),
+    'Beja': (36.7256, 9.1814),
+    'Siliana': (36.0831, 9.3708),
+    'Zaghouan': (36.4019, 10.1428),
+    'Medenine': (33.3547, 10.5053),
+    'Tataouine': (32.9297, 10.4517),
+    'Gafsa': (34.4256, 8.7842),
+    'Tozeur': (33.9197, 8.1336),
+    'Kebili': (33.7042, 8.9694)
+})
+
+# Business search terms in multiple languages
+_BUSINESS_TERMS = types.MappingProxyType({
+    'doctors': (
+        # General Medical Practitioners
+        'médecin', 'médecin généraliste', 'cabinet médical', 'docteur', 
+        'consultation médicale', 'médecin de famille', 'doctors', 'طبيب', 'طبيبة',
+        
+        # Specialized Doctors
+        'cardiologue', 'dermatologue', 'gynécologue', 'pédiatre', 
+        'ophtalmologue', 'orthopédiste', 'ORL', 'oto-rhino-laryngologiste',
+        'neurologue', 'psychiatre', 'endocrinologue', 'urologue', 'radiologue',
+        
+        # Clinics & Health Centers
+        'clinique privée', 'centre médical', 'centre de santé', 'polyclinique',
+        'centre hospitalier', 'hôpital privé', 'hospital', 'hôpital', 'مستشفى',
+        'clinic', 'clinique', 'عيادة', 'medical center', 'مركز طبي',
+        
+        # Dentists & Oral Care
+        'dentiste', 'orthodontiste', 'stomatologue', 'cabinet dentaire',
+        
+        # Optical & Vision
+        'opticien', 'ophtalmologie', 'centre optique',
+        
+        # Pharmacy & Paramedical
+        'pharmacie', 'parapharmacie', 'laboratoire d\'analyses médicales',
+        'centre de radiologie', 'kinésithérapeute', 'ostéopathe', 'psychologue',
+        'infirmier cabinet', 'infirmier', 'sage-femme',
+        
+        # Additional terms
+        'health', 'santé', 'صحة', 'médecine', 'طب'
+    ),
+    'jewelry': (
+        'jewelry', 'bijouterie', 'مجوهرات', 'jeweler', 'bijoutier', 'صائغ',
+        'gold', 'or', 'ذهب', 'silver', 'argent', 'فضة', 'diamonds', 'diamants', 'ألماس'
+    ),
+    'lawyers': (
+        'lawyer', 'avocat', 'محامي', 'attorney', 'legal', 'juridique', 'قانوني',
+        'court', 'tribunal', 'محكمة', 'notary', 'notaire', 'كاتب عدل'
+    )
+})
+
+# Synonyms that return mostly the same Maps results, only the first one found
+# in a term list is searched early, the others are moved to the end
+_SYNONYM_GROUPS = (
+    ('médecin', 'docteur', 'doctors', 'طبيب', 'طبيبة', 'médecin généraliste', 'médecin de famille'),
+    ('hôpital', 'hospital', 'مستشفى', 'hôpital privé', 'centre hospitalier'),
+    ('clinique', 'clinic', 'عيادة', 'clinique privée', 'polyclinique'),
+    ('centre médical', 'medical center', 'مركز طبي', 'centre de santé'),
+    ('santé', 'health', 'صحة', 'médecine', 'طب'),
+    ('dentiste', 'cabinet dentaire'),
+    ('ophtalmologue', 'ophtalmologie'),
+    ('ORL', 'oto-rhino-laryngologiste'),
+    ('pharmacie', 'parapharmacie'),
+    ('infirmier', 'infirmier cabinet'),
+    ('jewelry', 'bijouterie', 'مجوهرات'),
+    ('jeweler', 'bijoutier', 'صائغ'),
+    ('gold', 'or', 'ذهب'),
+    ('silver', 'argent', 'فضة'),
+    ('diamonds', 'diamants', 'ألماس'),
+    ('lawyer', 'avocat', 'محامي', 'attorney'),
+    ('legal', 'juridique', 'قانوني'),
+    ('court', 'tribunal', 'محكمة'),
+    ('notary', 'notaire', 'كاتب عدل')
+)
+_SYNONYM_GROUP_OF = {term: i for i, group in enumerate(_SYNONYM_GROUPS) for term in group}
+
+# A search is saturated after this many terms in a row bring less than this share of new businesses
+_SATURATION_STREAK = 3
+_SATURATION_RATIO = 0.1
+
+
+def _prioritize_terms(search_terms, limit: int) -> tuple:
+    """
+    Pick at most limit terms: the first term of each synonym group, in list order,
+    then the other synonyms of those groups only. Returns (first, repeats)
+    """
+    first, seen_groups = [], set()
+    for term in search_terms:
+        group = _SYNONYM_GROUP_OF.get(term, term)
+        if group not in seen_groups:
+            first.append(term)
+            seen_groups.add(group)
+    first = first[:limit]
+    
+    kept_groups = {_SYNONYM_GROUP_OF.get(term, term) for term in first}
+    repeats = [
+        term for term in search_terms
+        if term not in first and _SYNONYM_GROUP_OF.get(term, term) in kept_groups
+    ]
+    return first, repeats[:limit - len(first)]
+
+_MAPS_SEARCH_URL = 'https://www.google.com/maps/search/'
+
+# Page-JSON requests to Google in flight at once, across every scraper thread
+_MAPS_HTTP_CONCURRENCY = 8
+_maps_http_slots = threading.BoundedSemaphore(_MAPS_HTTP_CONCURRENCY)
+
+# Results farther than this from the searched city's center belong to a neighboring city
+_CITY_RADIUS_KM = 25
+_EARTH_RADIUS_KM = 6371.0
+
+
+@functools.lru_cache(maxsize=None)
+def _city_suffix(city: str) -> str:
+    """Encoded ' in <city>, Tunisia' part of the search URL, built once per city"""
+    return quote_plus(f" in {city}, Tunisia")
+
+
+class _DriverPool:
+    """Bounded pool of Chrome drivers, so browsers are reused across searches and scrapers"""
+    
+    def __init__(self, factory, size: int):
+        self.factory = factory
+        self.size = size
+        self._idle = queue.Queue(maxsize=size)
+        self._drivers = []
+        self._queries = {}  # Searches run by each driver since it was started
+        self._starting = 0  # Pool slots reserved by drivers being started
+        self._lock = threading.Lock()
+    
+    def acquire(self, timeout: float = 600):
+        """
+        Check out a driver, creating one while the pool is not full. Returns None if Chrome fails
+        to start, raises TimeoutError if every driver stays busy for longer than timeout seconds
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            
+            if self._reserve_slot():
+                return self._start_driver()
+            
+            # Every driver is busy: wait for one to be released, checking again now and
+            # then for a slot freed by a failed restart or a shutdown()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"No Chrome driver was released within {timeout:g}s")
+            try:
+                return self._idle.get(timeout=min(remaining, 1))
+            except queue.Empty:
+                pass
+    
+    def _reserve_slot(self) -> bool:
+        """Claim room for one more driver, so Chrome can start without holding the lock"""
+        with self._lock:
+            if len(self._drivers) + self._starting >= self.size:
+                return False
+            self._starting += 1
+            return True
+    
+    def _start_driver(self):
+        """Start a driver in a reserved slot, returns None if Chrome fails to start"""
+        driver = None
+        try:
+            driver = self.factory()
+        finally:
+            with self._lock:
+                self._starting -= 1
+                if driver:
+                    self._drivers.append(driver)
+        return driver
+    
+    def release(self, driver):
+        """Return a driver to the pool"""
+        with self._lock:
+            # Drivers checked out before a shutdown() are already closed
+            if driver in self._drivers:
+                self._idle.put(driver)
+    
+    def queries(self, driver) -> int:
+        """Number of searches run by a driver since it was started"""
+        with self._lock:
+            return self._queries.get(driver, 0)
+    
+    def count_queries(self, driver, count: int):
+        """Record searches run by a driver"""
+        with self._lock:
+            self._queries[driver] = self._queries.get(driver, 0) + count
+    
+    def restart(self, driver):
+        """Replace a checked-out driver by a fresh one, returns None if Chrome fails to start"""
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            self._queries.pop(driver, None)
+            self._starting += 1  # The replacement keeps the old driver's slot
+        
+        # A stuck browser can block quit() too, don't wait for it
+        threading.Thread(target=self._quit, args=(driver,), daemon=True).start()
+        
+        return self._start_driver()
+    
+    def shutdown(self):
+        """Quit every driver, the pool starts new ones on the next acquire()"""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._queries = {}
+            
+            # Empty the queue in place, threads waiting in acquire() keep using it
+            while True:
+                try:
+                    self._idle.get_nowait()
+                except queue.Empty:
+                    break
+        
+        for driver in drivers:
+            self._quit(driver)
+    
+    @staticmethod
+    def _quit(driver):
+        try:
+            driver.quit()
+        except:
+            pass
+
+
+# One pool per headless mode, shared by every GoogleMapsScraper in the process
+_driver_pools = {}
+_driver_pools_lock = threading.Lock()
+
+# Serializes appends to streamed CSV files
+_csv_lock = threading.Lock()
+
+
+def _get_driver_pool(headless: bool, size: int, factory) -> _DriverPool:
+    """Return the shared driver pool for a headless mode, creating it on first use"""
+    with _driver_pools_lock:
+        if headless not in _driver_pools:
+            _driver_pools[headless] = _DriverPool(factory, size)
+        return _driver_pools[headless]
+
+
+@atexit.register
+def _shutdown_driver_pools():
+    for pool in _driver_pools.values():
+        pool.shutdown()
 
 
 class GoogleMapsScraper:
     """Direct Google Maps scraper for maximum results"""
     
-    def __init__(self, headless: bool = True):
+    __slots__ = (
+        'headless', 'max_tabs', 'cache_dir', 'cache_max_age', 'restart_every',
+        'session', 'pool', 'tunisia_cities', 'business_terms', '_terms_slice'
+    )
+    
+    def __init__(self, headless: bool = True, max_tabs: int = 4, pool_size: int = 3, restart_every: int = 25,
+                 cache_dir: str = os.path.join('.cache', 'gmaps'), cache_max_age: int = 86400):
         self.headless = headless
-        self.driver = None
-        
-        # Tunisian cities with coordinates
-        self.tunisia_cities = {
-            'Tunis': (36.8065, 10.1815),
-            'Sfax': (34.7406, 10.7603),
-            'Sousse': (35.8256, 10.6411),
-            'Kairouan': (35.6781, 10.0963),
-            'Bizerte': (37.2744, 9.8739),
-            'Gabès': (33.8881, 10.0972),
-            'Ariana': (36.8601, 10.1931),
-            'Ben Arous': (36.7531, 10.2189),
-            'Manouba': (36.8081, 10.0972),
-            'Nabeul': (36.4561, 10.7376),
-            'Monastir': (35.7781, 10.8262),
-            'Mahdia': (35.5047, 11.0442),
-            'Kasserine': (35.1678, 8.8361),
-            'Sidi Bouzid': (35.0381, 9.4847),
-            'Kef': (36.1822, 8.7147),
-            'Jendouba': (36.5011, 8.7803),
-            'Beja': (36.7256, 9.1814),
-            'Siliana': (36.0831, 9.3708),
-            'Zaghouan': (36.4019, 10.1428),
-            'Medenine': (33.3547, 10.5053),
-            'Tataouine': (32.9297, 10.4517),
-            'Gafsa': (34.4256, 8.7842),
-            'Tozeur': (33.9197, 8.1336),
-            'Kebili': (33.7042, 8.9694)
-        }
+        self.max_tabs = max_tabs  # Search terms loaded in parallel tabs
+        self.cache_dir = cache_dir
+        self.cache_max_age = cache_max_age  # Seconds before a cached search is scraped again
+        self.restart_every = restart_every  # Searches before a driver is replaced by a fresh one
         
-        # Business search terms in multiple languages
-        self.business_terms = {
-            'doctors': [
-                # General Medical Practitioners
-                'médecin', 'médecin généraliste', 'cabinet médical', 'docteur', 
-                'consultation médicale', 'médecin de famille', 'doctors', 'طبيب', 'طبيبة',
-                
-                # Specialized Doctors
-                'cardiologue', 'dermatologue', 'gynécologue', 'pédiatre', 
-                'ophtalmologue', 'orthopédiste', 'ORL', 'oto-rhino-laryngologiste',
-                'neurologue', 'psychiatre', 'endocrinologue', 'urologue', 'radiologue',
-                
-                # Clinics & Health Centers
-                'clinique privée', 'centre médical', 'centre de santé', 'polyclinique',
-                'centre hospitalier', 'hôpital privé', 'hospital', 'hôpital', 'مستشفى',
-                'clinic', 'clinique', 'عيادة', 'medical center', 'مركز طبي',
-                
-                # Dentists & Oral Care
-                'dentiste', 'orthodontiste', 'stomatologue', 'cabinet dentaire',
-                
-                # Optical & Vision
-                'opticien', 'ophtalmologie', 'centre optique',
-                
-                # Pharmacy & Paramedical
-                'pharmacie', 'parapharmacie', 'laboratoire d\'analyses médicales',
-                'centre de radiologie', 'kinésithérapeute', 'ostéopathe', 'psychologue',
-                'infirmier cabinet', 'infirmier', 'sage-femme',
-                
-                # Additional terms
-                'health', 'santé', 'صحة', 'médecine', 'طب'
-            ],
-            'jewelry': [
-                'jewelry', 'bijouterie', 'مجوهرات', 'jeweler', 'bijoutier', 'صائغ',
-                'gold', 'or', 'ذهب', 'silver', 'argent', 'فضة', 'diamonds', 'diamants', 'ألماس'
-            ],
-            'lawyers': [
-                'lawyer', 'avocat', 'محامي', 'attorney', 'legal', 'juridique', 'قانوني',
-                'court', 'tribunal', 'محكمة', 'notary', 'notaire', 'كاتب عدل'
-            ]
-        }
+        # Plain HTTP session for the embedded-JSON fast path
+        self.session = requests.Session()
+        self.session.headers['User-Agent'] = _USER_AGENT
+        self.session.cookies.set('CONSENT', 'YES+', domain='.google.com')
+        
+        # Drivers are shared with other scrapers and only started once a
+        # search term needs the browser (the page JSON answers most of them)
+        self.pool = _get_driver_pool(headless, pool_size, self.setup_driver)
+        
+        self.tunisia_cities = _TUNISIA_CITIES
+        self.business_terms = _BUSINESS_TERMS
+        
+        # Up to 15 searches per type: one term per synonym group first, then
+        # synonyms of those groups, only searched while they find new businesses
+        self._terms_slice = {}
+        for business_type, terms in self.business_terms.items():
+            first, repeats = _prioritize_terms(terms, 15)
+            self._terms_slice[business_type] = (tuple(first), tuple(repeats))
     
     def setup_driver(self):
-        """Setup Chrome driver with proper options"""
+        """Setup Chrome driver with proper options, returns None on failure"""
         try:
             chrome_options = Options()
             
             if self.headless:
                 chrome_options.add_argument('--headless')
             
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+            for flag in _CHROME_FLAGS:
+                chrome_options.add_argument(flag)
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+            chrome_options.add_argument(f'--user-agent={_USER_AGENT}')
             
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            driver = webdriver.Chrome(options=chrome_options)
+            driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+            self._block_resources(driver)
             
             print("✅ Chrome driver setup successful")
-            return True
+            return driver
             
         except Exception as e:
             print(f"❌ Chrome driver setup failed: {e}")
             print("Please install Chrome and ChromeDriver")
-            return False
+            return None
+    
+    def _block_resources(self, driver):
+        """Stop the current tab from downloading images, fonts and trackers"""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': _BLOCKED_URLS})
     
-    def search_google_maps(self, city: str, business_type: str) -> List[Dict]:
-        """Search Google Maps for businesses in a specific city"""
-        if not self.driver:
-            if not self.setup_driver():
-                return []
+    def search_google_maps(self, city: str, business_type: str, output_file: str = None) -> List[Dict]:
+        """
+        Search Google Maps for businesses in a specific city
         
+        When output_file is given, the results of each search term are appended
+        to that CSV as soon as they are scraped and an empty list is returned
+        """
         businesses = []
-        search_terms = self.business_terms.get(business_type, [])
+        seen_keys = set()
+        low_novelty_streak = 0
+        
+        def collect(term_businesses: List[Dict]) -> bool:
+            """Keep a term's results, returns True once new terms stop finding new businesses"""
+            nonlocal low_novelty_streak
+            
+            # Drop hits from neighboring cities before they reach the file or the dedup
+            term_df = self._within_radius(pd.DataFrame(term_businesses), city)
+            term_businesses = term_df.to_dict('records')
+            
+            if output_file:
+                if term_businesses:
+                    self.save_to_csv(term_df, output_file, append=True)
+            else:
+                businesses.extend(term_businesses)
+            
+            keys = {
+                (business.get('name', '').lower().strip(), business.get('address', '').lower().strip())
+                for business in term_businesses
+            }
+            new_keys = keys - seen_keys
+            seen_keys.update(new_keys)
+            
+            if len(new_keys) / max(1, len(keys)) < _SATURATION_RATIO:
+                low_novelty_streak += 1
+            else:
+                low_novelty_streak = 0
+            return low_novelty_streak >= _SATURATION_STREAK
+        
+        # One term per synonym group first, so saturation cuts the redundant ones
+        search_terms, repeat_terms = self._terms_slice.get(business_type, ((), ()))
         
         print(f"🗺️  Searching Google Maps for {business_type} in {city}")
         print(f"Using {len(search_terms)} different search terms...")
         
-        for i, search_term in enumerate(search_terms[:15]):  # Limit to 15 searches per type
-            print(f"  {i+1}/15: '{search_term}'")
-            
+        saturated = self._search_terms(search_terms, city, business_type, collect)
+        
+        if repeat_terms and saturated:
+            print(f"  ⏭️  No new results from the last terms, skipping {len(repeat_terms)} synonyms")
+        elif repeat_terms:
+            print(f"Searching {len(repeat_terms)} synonyms of the terms above...")
+            self._search_terms(repeat_terms, city, business_type, collect)
+        
+        if output_file:
+            print(f"✅ {business_type} results written to {output_file}")
+            return []
+        
+        # Remove duplicates
+        unique_businesses = self._remove_duplicates(businesses)
+        print(f"✅ Total unique {business_type}: {len(unique_businesses)}")
+        
+        return unique_businesses
+    
+    def _search_terms(self, search_terms: List[str], city: str, business_type: str, collect) -> bool:
+        """
+        Search terms from the cache, the page JSON and finally the browser, passing each
+        term's results to collect. Returns True if the search ended saturated
+        """
+        # Reuse recent results from the disk cache
+        pending_terms = []
+        saturated = False
+        for search_term in search_terms:
+            cached = self._cache_get(self._cache_key(city, business_type, search_term))
+            if cached is None:
+                pending_terms.append(search_term)
+            else:
+                print(f"  💾 '{search_term}': {len(cached)} cached results")
+                saturated = collect(cached)
+        
+        # Fetch the remaining terms over plain HTTP, all at once, and only
+        # open the browser for the terms whose page JSON could not be read
+        browser_terms = []
+        for search_term, term_businesses in self._fetch_maps_json_batch(pending_terms, city, business_type):
+            if term_businesses:
+                print(f"  ⚡ '{search_term}': {len(term_businesses)} results from page data")
+                saturated = collect(term_businesses)
+                self._cache_put(self._cache_key(city, business_type, search_term), term_businesses)
+            else:
+                browser_terms.append(search_term)
+        
+        if browser_terms and saturated:
+            print(f"  ⏭️  No new results from the last terms, skipping {len(browser_terms)} browser searches")
+        elif browser_terms:
             try:
-                # Search on Google Maps
-                search_query = f"{search_term} in {city}, Tunisia"
-                self.driver.get(f"https://www.google.com/maps/search/{quote(search_query)}")
+                driver = self.pool.acquire()
+            except TimeoutError as e:
+                print(f"  ❌ {e}, skipping {len(browser_terms)} browser searches")
+                driver = None
+            
+            # A browser failure keeps the results collected so far
+            if driver is not None:
+                try:
+                    saturated = self._scrape_terms(driver, browser_terms, city, business_type, collect)
+                except Exception as e:
+                    print(f"  ❌ Browser error for {business_type}: {e}")
+        
+        return saturated
+    
+    def _fetch_maps_json_batch(self, search_terms: List[str], city: str, business_type: str) -> List[tuple]:
+        """Fetch the page JSON of several search terms in parallel, returns (term, businesses or None) pairs"""
+        if not search_terms:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(_MAPS_HTTP_CONCURRENCY, len(search_terms))) as executor:
+            results = executor.map(
+                lambda search_term: self._fetch_maps_json(self._search_url(search_term, city), business_type, city),
+                search_terms
+            )
+            return list(zip(search_terms, results))
+    
+    def _fetch_maps_json(self, url: str, business_type: str, city: str) -> Optional[List[Dict]]:
+        """Read the search results embedded in the Google Maps page without a browser, None on failure"""
+        try:
+            # Business types are scraped in parallel, each with its own batch
+            with _maps_http_slots:
+                response = self.session.get(url, timeout=15)
+            response.raise_for_status()
+            
+            match = _APP_STATE_RE.search(response.text)
+            if not match:
+                return None
+            
+            # The results are a JSON string, prefixed with )]}', inside the state array
+            for payload in _dig(json.loads(match.group(1)), 3) or []:
+                if isinstance(payload, str) and payload.startswith(")]}'"):
+                    places = _dig(json.loads(payload[payload.index('\n') + 1:]), 0, 1) or []
+                    businesses = [
+                        self._place_to_business(place, business_type, city)
+                        for place in places[1:]
+                    ]
+                    return [business for business in businesses if business] or None
+        
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"    ⚠️  Page data error: {e}")
+        
+        return None
+    
+    def _place_to_business(self, place: list, business_type: str, city: str) -> Optional[Dict]:
+        """Convert one place from the page JSON to a business dictionary"""
+        details = _dig(place, 14)
+        name = _dig(details, 11)
+        if not name:
+            return None
+        
+        return {
+            'name': name,
+            'business_type': business_type,
+            'address': _dig(details, 39) or _dig(details, 18) or '',
+            'city': city,
+            'region': 'Tunisia',
+            'phone': _dig(details, 178, 0, 0) or '',
+            'website': _dig(details, 7, 0) or '',
+            'rating': _dig(details, 4, 7) or '',
+            'reviews_count': _dig(details, 4, 8) or '',
+            'latitude': _dig(details, 9, 2) or '',
+            'longitude': _dig(details, 9, 3) or '',
+            'data_source': 'Google Maps Direct'
+        }
+    
+    def _scrape_terms(self, driver, search_terms: List[str], city: str, business_type: str, collect):
+        """
+        Scrape search terms with the browser, passing each term's results to collect,
+        and stop once collect reports that new terms no longer find new businesses
+        
+        The driver is handed back to the pool at the end, or its replacement
+        if the browser had to be restarted. Returns True if the search ended saturated
+        """
+        saturated = False
+        
+        try:
+            # Load several search terms at once in separate tabs of the same browser,
+            # so the network/JS wait of one page overlaps with the others
+            for start in range(0, len(search_terms), self.max_tabs):
+                batch = search_terms[start:start + self.max_tabs]
                 
-                # Wait for results to load
-                time.sleep(3)
+                # Restart long-running or stuck browsers to keep memory bounded
+                if self.pool.queries(driver) >= self.restart_every or not self._is_responsive(driver):
+                    print("    🔄 Restarting Chrome driver")
+                    driver = self.pool.restart(driver)
+                    if driver is None:
+                        return saturated
+                self.pool.count_queries(driver, len(batch))
                 
-                # Scroll to load more results
-                self._scroll_to_load_more()
+                try:
+                    tabs = self._open_search_tabs(driver, batch, city)
+                except Exception as e:
+                    print(f"    ❌ Error opening tabs for {batch}: {e}")
+                    self._close_search_tabs(driver)
+                    continue
                 
-                # Extract business information
-                business_elements = self._extract_business_elements()
+                for i, (search_term, tab) in enumerate(zip(batch, tabs), start + 1):
+                    print(f"  {i}/{len(search_terms)}: '{search_term}'")
+                    
+                    try:
+                        driver.switch_to.window(tab)
+                        
+                        # Wait for results to load
+                        try:
+                            WebDriverWait(driver, 8).until(
+                                EC.presence_of_element_located((By.CSS_SELECTOR, 'div[role="feed"], .Nv2PK'))
+                            )
+                        except TimeoutException:
+                            print("    ⚠️  Results did not load in time")
+                        
+                        # Scroll to load more results
+                        self._scroll_to_load_more(driver)
+                        
+                        # Extract business information
+                        business_elements = self._extract_business_elements(driver)
+                        
+                        term_businesses = []
+                        for element in business_elements:
+                            business = self._extract_business_info(driver, element, business_type, city)
+                            if business:
+                                term_businesses.append(business)
+                        
+                        saturated = collect(term_businesses)
+                        # An empty page is usually a failed or timed-out load, scrape it again next time
+                        if term_businesses:
+                            self._cache_put(self._cache_key(city, business_type, search_term), term_businesses)
+                        
+                        print(f"    ✅ Found {len(business_elements)} elements")
+                        
+                    except Exception as e:
+                        print(f"    ❌ Error with '{search_term}': {e}")
+                        continue
                 
-                for element in business_elements:
-                    business = self._extract_business_info(element, business_type, city)
-                    if business:
-                        businesses.append(business)
+                self._close_search_tabs(driver, tabs)
                 
-                print(f"    ✅ Found {len(business_elements)} elements")
+                if saturated:
+                    print(f"  ⏭️  No new results from the last terms, skipping the remaining ones")
+                    break
                 
                 # Rate limiting
                 time.sleep(2)
-                
-            except Exception as e:
-                print(f"    ❌ Error with '{search_term}': {e}")
-                continue
+            
+            return saturated
+        finally:
+            # Hand back the current driver, a dead one is restarted by its next user
+            if driver is not None:
+                self.pool.release(driver)
+    
+    def _is_responsive(self, driver, timeout: float = 30) -> bool:
+        """Check that the browser still answers a trivial script within the timeout"""
+        answers = []
         
-        # Remove duplicates
-        unique_businesses = self._remove_duplicates(businesses)
-        print(f"✅ Total unique {business_type}: {len(unique_businesses)}")
+        def ping():
+            try:
+                answers.append(driver.execute_script('return 1'))
+            except Exception:
+                pass
         
-        return unique_businesses
+        watchdog = threading.Thread(target=ping, daemon=True)
+        watchdog.start()
+        watchdog.join(timeout)
+        return bool(answers)
+    
+    def _cache_key(self, city: str, business_type: str, search_term: str) -> str:
+        """Hash a search into a cache file name"""
+        return hashlib.sha256(f"{city}|{business_type}|{search_term}".encode('utf-8')).hexdigest()
+    
+    def _cache_get(self, key: str) -> Optional[List[Dict]]:
+        """Return cached businesses for a search, or None if missing, empty or too old"""
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            if time.time() - os.path.getmtime(path) > self.cache_max_age:
+                return None
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)['businesses'] or None
+        except (OSError, ValueError, KeyError):
+            return None
+    
+    def _cache_put(self, key: str, businesses: List[Dict]):
+        """Store the businesses found for a search"""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(os.path.join(self.cache_dir, f"{key}.json"), 'w', encoding='utf-8') as f:
+                json.dump({'timestamp': time.time(), 'businesses': businesses}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"    ⚠️  Cache write error: {e}")
+    
+    def _search_url(self, search_term: str, city: str) -> str:
+        """Build the Google Maps search URL for a term in a city"""
+        return _MAPS_SEARCH_URL + quote_plus(search_term) + _city_suffix(city)
     
-    def _scroll_to_load_more(self):
+    def _open_search_tabs(self, driver, search_terms: List[str], city: str) -> List[str]:
+        """Open one tab per search term and start loading all of them"""
+        tabs = []
+        for search_term in search_terms:
+            driver.switch_to.new_window('tab')
+            self._block_resources(driver)  # Blocking is per tab
+            # Unlike driver.get(), Page.navigate returns as soon as the navigation starts
+            driver.execute_cdp_cmd('Page.navigate', {'url': self._search_url(search_term, city)})
+            tabs.append(driver.current_window_handle)
+        
+        return tabs
+    
+    def _close_search_tabs(self, driver, tabs: List[str] = None):
+        """
+        Close the search tabs (by default every tab but the main one) and go back
+        to the main window. A browser that died is left as is, it gets restarted
+        before its next batch
+        """
+        try:
+            if tabs is None:
+                tabs = driver.window_handles[1:]
+            
+            for tab in tabs:
+                try:
+                    driver.switch_to.window(tab)
+                    driver.close()
+                except:
+                    pass
+            
+            driver.switch_to.window(driver.window_handles[0])
+        except Exception as e:
+            print(f"    ⚠️  Could not reset the browser tabs: {e}")
+    
+    def _scroll_to_load_more(self, driver):
         """Scroll to load more results on Google Maps"""
         try:
             # Find the results panel
-            results_panel = self.driver.find_element(By.CSS_SELECTOR, '[role="main"]')
+            results_panel = driver.find_element(By.CSS_SELECTOR, '[role="main"]')
             
             # Scroll down multiple times to load more results
             for _ in range(5):
-                self.driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", results_panel)
-                time.sleep(2)
+                previous_height = self._scroll_height(driver, results_panel)
+                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight", results_panel)
+                if self._wait_for_more_results(driver, results_panel, previous_height):
+                    continue
                 
                 # Check if "Show more results" button exists and click it
                 try:
-                    show_more_button = self.driver.find_element(By.XPATH, "//button[contains(text(), 'Show more results') or contains(text(), 'Afficher plus de résultats')]")
+                    show_more_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Show more results') or contains(text(), 'Afficher plus de résultats')]")
                     if show_more_button.is_displayed():
                         show_more_button.click()
-                        time.sleep(2)
+                        if self._wait_for_more_results(driver, results_panel, previous_height):
+                            continue
                 except:
                     pass
+                
+                # Nothing new was loaded: we reached the end of the results
+                break
                     
         except Exception as e:
             print(f"    ⚠️  Scroll error: {e}")
     
-    def _extract_business_elements(self) -> List:
+    def _scroll_height(self, driver, element) -> int:
+        """Return the scrollable height of an element"""
+        return driver.execute_script("return arguments[0].scrollHeight", element)
+    
+    def _wait_for_more_results(self, driver, results_panel, previous_height: int, timeout: float = 5) -> bool:
+        """Wait until the results panel grows, returns False if it did not"""
+        try:
+            WebDriverWait(driver, timeout).until(
+                lambda d: self._scroll_height(d, results_panel) > previous_height
+            )
+            return True
+        except TimeoutException:
+            return False
+    
+    def _extract_business_elements(self, driver) -> List:
         """Extract business elements from the page"""
         try:
             # Multiple selectors to catch different result formats
@@ -205,25 +854,16 @@ class GoogleMapsScraper:
                 '.lI9IFe'
             ]
             
-            elements = []
-            for selector in selectors:
-                try:
-                    found_elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    elements.extend(found_elements)
-                except:
-                    continue
+            # One selector list gets the union in a single round-trip
+            elements = driver.find_elements(By.CSS_SELECTOR, ', '.join(selectors))
             
-            # Remove duplicates
+            # Remove duplicates, WebElement ids are stable so no attribute reads are needed
             unique_elements = []
             seen = set()
             for element in elements:
-                try:
-                    element_id = element.get_attribute('data-result-index') or str(element.location)
-                    if element_id not in seen:
-                        seen.add(element_id)
-                        unique_elements.append(element)
-                except:
-                    continue
+                if element.id not in seen:
+                    seen.add(element.id)
+                    unique_elements.append(element)
             
             return unique_elements
             
@@ -231,7 +871,7 @@ class GoogleMapsScraper:
             print(f"    ❌ Element extraction error: {e}")
             return []
     
-    def _extract_business_info(self, element, business_type: str, city: str) -> Optional[Dict]:
+    def _extract_business_info(self, driver, element, business_type: str, city: str) -> Optional[Dict]:
         """Extract business information from a Google Maps element"""
         try:
             # Click on the element to get more details
@@ -256,124 +896,17 @@ class GoogleMapsScraper:
                 'data_source': 'Google Maps Direct'
             }
             
-            # Extract name
-            try:
-                name_selectors = [
-                    'h1[data-attrid="title"]',
-                    'h1',
-                    '[data-attrid="title"]',
-                    '.x3AX1-LfntMc-header-title-title',
-                    '.SPZz6b h1'
-                ]
-                
-                for selector in name_selectors:
-                    try:
-                        name_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        business_info['name'] = name_element.text.strip()
-                        break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract address
-            try:
-                address_selectors = [
-                    '[data-item-id="address"]',
-                    '.Io6YTe',
-                    '.LrzXr',
-                    '[data-attrid="kc:/location/location:address"]'
-                ]
-                
-                for selector in address_selectors:
-                    try:
-                        address_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        business_info['address'] = address_element.text.strip()
-                        break
-                    except:
-                        continue
-            except:
-                pass
+            # Read every candidate field in one round-trip to the browser
+            candidates = driver.execute_script(_EXTRACT_FIELDS_JS, _FIELD_SELECTORS)
             
-            # Extract phone
-            try:
-                phone_selectors = [
-                    '[data-item-id*="phone"]',
-                    '[data-attrid="kc:/business/phone:phone"]',
-                    '.Io6YTe[data-value*="+"]'
-                ]
-                
-                for selector in phone_selectors:
-                    try:
-                        phone_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        phone_text = phone_element.text.strip()
-                        if re.search(r'[\+]?[0-9\s\-\(\)]+', phone_text):
-                            business_info['phone'] = phone_text
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract website
-            try:
-                website_selectors = [
-                    '[data-item-id*="website"]',
-                    '[data-attrid="kc:/business/website:website"]',
-                    'a[href*="http"]'
-                ]
-                
-                for selector in website_selectors:
-                    try:
-                        website_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        href = website_element.get_attribute('href')
-                        if href and 'http' in href:
-                            business_info['website'] = href
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract rating
-            try:
-                rating_selectors = [
-                    '.ceNzKf',
-                    '.MW4etd',
-                    '[data-attrid="kc:/business/rating:rating"]'
-                ]
-                
-                for selector in rating_selectors:
-                    try:
-                        rating_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        rating_text = rating_element.text.strip()
-                        if re.search(r'[0-9]+\.[0-9]+', rating_text):
-                            business_info['rating'] = rating_text
-                            break
-                    except:
-                        continue
-            except:
-                pass
-            
-            # Extract reviews count
-            try:
-                reviews_selectors = [
-                    '.UY7F9',
-                    '.HHrUdb',
-                    '[data-attrid="kc:/business/rating:review_count"]'
-                ]
-                
-                for selector in reviews_selectors:
-                    try:
-                        reviews_element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                        reviews_text = reviews_element.text.strip()
-                        if re.search(r'[0-9]+', reviews_text):
-                            business_info['reviews_count'] = reviews_text
-                            break
-                    except:
-                        continue
-            except:
-                pass
+            business_info['name'] = self._first_match(candidates['name'])
+            business_info['address'] = self._first_match(candidates['address'])
+            business_info['phone'] = self._first_match(candidates['phone'], _PHONE_RE.search)
+            business_info['website'] = self._first_match(candidates['website'], lambda href: 'http' in href)
+            business_info['rating'] = self._first_match(candidates['rating'], _RATING_RE.search)
+            business_info['reviews_count'] = self._first_match(
+                candidates['reviews_count'], lambda text: any(c.isdigit() for c in text)
+            )
             
             # Only return if we have at least a name
             if business_info['name']:
@@ -384,17 +917,43 @@ class GoogleMapsScraper:
         
         return None
     
-    def scrape_all_business_types(self, city: str, business_types: List[str]) -> pd.DataFrame:
-        """Scrape all business types for a city"""
+    def _first_match(self, values: List[Optional[str]], accept=None) -> str:
+        """Return the first value found on the page that passes the check"""
+        for value in values:
+            if value is None:
+                continue
+            value = value.strip()
+            if accept is None or accept(value):
+                return value
+        return ''
+    
+    def scrape_all_business_types(self, city: str, business_types: List[str], output_file: str = None) -> pd.DataFrame:
+        """
+        Scrape all business types for a city
+        
+        With output_file, results are streamed to that CSV while scraping, so a
+        crash does not lose them, and the file is deduplicated at the end
+        """
         all_businesses = []
         
-        for business_type in business_types:
-            print(f"\n🔍 Scraping {business_type} in {city}...")
-            businesses = self.search_google_maps(city, business_type)
-            all_businesses.extend(businesses)
+        # Business types are independent searches: run them side by side,
+        # each worker checks out its own driver from the pool
+        with ThreadPoolExecutor(max_workers=max(1, min(len(business_types), self.pool.size))) as executor:
+            futures = {}
+            for business_type in business_types:
+                print(f"\n🔍 Scraping {business_type} in {city}...")
+                futures[executor.submit(self.search_google_maps, city, business_type, output_file)] = business_type
             
-            # Rate limiting between business types
-            time.sleep(3)
+            for future in as_completed(futures):
+                try:
+                    all_businesses.extend(future.result())
+                except Exception as e:
+                    print(f"❌ Error scraping {futures[future]}: {e}")
+        
+        if output_file:
+            df = self._dedupe_csv(output_file)
+            print(f"\n🎉 TOTAL UNIQUE BUSINESSES: {len(df)}")
+            return df
         
         # Remove duplicates
         unique_businesses = self._remove_duplicates(all_businesses)
@@ -403,31 +962,73 @@ class GoogleMapsScraper:
         
         return pd.DataFrame(unique_businesses)
     
+    def _dedupe_csv(self, filename: str) -> pd.DataFrame:
+        """Deduplicate a streamed results file in place and return its content"""
+        if not os.path.exists(filename):
+            return pd.DataFrame()
+        
+        df = self._drop_duplicate_rows(pd.read_csv(filename, dtype=str, keep_default_na=False))
+        write_csv(df, filename)
+        return df
+    
     def _remove_duplicates(self, businesses: List[Dict]) -> List[Dict]:
-        """Remove duplicate businesses"""
-        seen = set()
-        unique = []
-        
-        for business in businesses:
-            key = (
-                business.get('name', '').lower().strip(),
-                business.get('address', '').lower().strip()
-            )
-            
-            if key not in seen and business.get('name'):
-                seen.add(key)
-                unique.append(business)
+        """Remove duplicate businesses and businesses without a name"""
+        if not businesses:
+            return []
+        
+        return self._drop_duplicate_rows(pd.DataFrame(businesses)).to_dict('records')
+    
+    def _within_radius(self, df: pd.DataFrame, city: str, km: float = _CITY_RADIUS_KM) -> pd.DataFrame:
+        """Keep rows within km of the city center, rows without coordinates are kept"""
+        center = self.tunisia_cities.get(city)
+        if center is None or df.empty or 'latitude' not in df:
+            return df
         
-        return unique
+        lat = np.radians(pd.to_numeric(df['latitude'], errors='coerce').to_numpy(float))
+        lon = np.radians(pd.to_numeric(df['longitude'], errors='coerce').to_numpy(float))
+        lat0, lon0 = np.radians(center)
+        
+        # Haversine distance, NaN for rows without coordinates
+        a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+        dist = 2 * _EARTH_RADIUS_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+        
+        return df[~(dist > km)]
+    
+    def _drop_duplicate_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Drop unnamed rows and rows with the same name and address"""
+        df = df.copy()
+        df['_k1'] = df['name'].fillna('').str.lower().str.strip()
+        df['_k2'] = df['address'].fillna('').str.lower().str.strip()
+        df = df[df['_k1'] != ''].drop_duplicates(subset=['_k1', '_k2'])
+        
+        return df.drop(columns=['_k1', '_k2'])
     
-    def save_to_csv(self, df: pd.DataFrame, filename: str = None) -> str:
-        """Save DataFrame to CSV file"""
+    def save_to_csv(self, df: pd.DataFrame, filename: str = None, append: bool = False,
+                    parquet: bool = False) -> str:
+        """Save DataFrame to CSV file, or append it (header written only for a new file),
+        optionally with a Parquet copy next to it"""
         if filename is None:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"google_maps_businesses_{timestamp}.csv"
         
-        df.to_csv(filename, index=False, encoding='utf-8')
+        if append:
+            # Several business types may stream into the same file at once
+            with _csv_lock:
+                write_header = not os.path.exists(filename) or os.path.getsize(filename) == 0
+                write_csv(df, filename, append=True, header=write_header)
+            return filename
+        
+        write_csv(df, filename)
         print(f"💾 Data saved to {filename}")
+        
+        if parquet:
+            parquet_file = os.path.splitext(filename)[0] + '.parquet'
+            if pa is not None:
+                pq.write_table(pa.Table.from_pandas(df, preserve_index=False), parquet_file)
+            else:
+                df.to_parquet(parquet_file, index=False)
+            print(f"💾 Parquet copy saved to {parquet_file}")
+        
         return filename
     
     def display_summary(self, df: pd.DataFrame):
@@ -449,9 +1050,8 @@ class GoogleMapsScraper:
         print(df[available_cols].head(10).to_string(index=False))
     
     def close(self):
-        """Close the driver"""
-        if self.driver:
-            self.driver.quit()
+        """Close the pooled drivers"""
+        self.pool.shutdown()
 
 
 def main():
@@ -489,11 +1089,12 @@ def main():
         print(f"\n🚀 SCRAPING GOOGLE MAPS for {business_types} in {city}...")
         print("This will open Chrome and scrape directly from Google Maps...")
         
-        df = scraper.scrape_all_business_types(city, business_types)
+        # Results are written to the file as they are scraped
+        filename = f"google_maps_businesses_{time.strftime('%Y%m%d_%H%M%S')}.csv"
+        df = scraper.scrape_all_business_types(city, business_types, output_file=filename)
         
         if not df.empty:
-            # Save and display results
-            filename = scraper.save_to_csv(df)
+            # Display results
             scraper.display_summary(df)
             print(f"\n🎉 GOOGLE MAPS SCRAPING COMPLETED!")
             print(f"📁 Data saved to: {filename}")
@@ -0,0 +1,62 @@
+"""
+On-disk HTTP response cache shared by the aiohttp based scrapers
+"""
+
+from aiohttp_client_cache import SQLiteBackend
+from aiohttp_client_cache.response import CachedResponse
+from yarl import URL
+from scraper_utils import json_loads
+
+
+# Request parameters carrying API keys: left out of cache keys and stored URLs
+_SECRET_PARAMS = ('key', 'api_key')
+
+# Google reports quota and request errors as HTTP 200 with one of these missing
+_OK_STATUSES = frozenset(['OK', 'ZERO_RESULTS'])
+
+
+async def _is_complete_answer(response) -> bool:
+    """
+    False for HTTP 200 bodies that are really errors: Google Places status other than
+    OK/ZERO_RESULTS, SerpApi error messages and Overpass runtime errors (remark)
+    """
+    try:
+        data = json_loads(await response.read())
+    except ValueError:
+        return False
+    
+    if not isinstance(data, dict):
+        return True
+    return data.get('status', 'OK') in _OK_STATUSES and not data.get('error') and not data.get('remark')
+
+
+def _redact(url) -> URL:
+    """URL without its API key parameters"""
+    url = URL(str(url))
+    return url.with_query([(k, v) for k, v in url.query.items() if k not in _SECRET_PARAMS])
+
+
+class _ApiResponseCache(SQLiteBackend):
+    """SQLite response cache that never stores API keys"""
+    
+    async def save_response(self, response, cache_key: str = None, expires=None):
+        cache_key = cache_key or self.create_key(response.method, response.url)
+        cached_response = await CachedResponse.from_client_response(response, expires)
+        cached_response.url = _redact(cached_response.url)
+        cached_response.real_url = _redact(cached_response.real_url)
+        await self.responses.write(cache_key, cached_response)
+        
+        # Alias any redirect requests to the same cache key
+        for r in response.history:
+            await self.redirects.write(self.create_key(r.method, r.url), cache_key)
+
+
+def api_cache(cache_file: str, expire_after: int) -> SQLiteBackend:
+    """Cache for GET and POST API responses, keeping only successful answers"""
+    return _ApiResponseCache(
+        cache_file,
+        expire_after=expire_after,
+        allowed_methods=('GET', 'POST'),
+        ignored_params=_SECRET_PARAMS,
+        filter_fn=_is_complete_answer
+    )
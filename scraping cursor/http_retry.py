@@ -0,0 +1,40 @@
+"""
+Retry policy shared by the aiohttp based scrapers
+"""
+
+import asyncio
+import aiohttp
+from tenacity import retry, retry_if_exception, stop_after_attempt, stop_after_delay, wait_random_exponential
+
+
+# Transient failures (rate limits, overloaded servers, dropped connections) are retried
+RETRY_STATUSES = frozenset([429, 502, 503, 504])
+_backoff = wait_random_exponential(multiplier=1, max=60)
+
+# No new attempt once this many seconds went by since the first one, so a slow
+# query that hit its client timeout (300s for Overpass) is not sent again
+_RETRY_DEADLINE = 300
+
+
+def is_transient(exc: BaseException) -> bool:
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in RETRY_STATUSES
+    return isinstance(exc, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def _wait_retry_after(retry_state) -> float:
+    """Wait as long as the server's Retry-After header asks, else back off exponentially with jitter"""
+    exc = retry_state.outcome.exception()
+    retry_after = (getattr(exc, 'headers', None) or {}).get('Retry-After', '')
+    if retry_after.isdigit():
+        return min(float(retry_after), 60)
+    return _backoff(retry_state)
+
+
+# Decorator for coroutines that send one request: up to 5 attempts on transient failures
+retry_transient = retry(
+    wait=_wait_retry_after,
+    stop=stop_after_attempt(5) | stop_after_delay(_RETRY_DEADLINE),
+    retry=retry_if_exception(is_transient),
+    reraise=True
+)
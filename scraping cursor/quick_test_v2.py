@@ -4,6 +4,7 @@ Quick test of Tunisia Business Scraper V2
 Tests the scraper without API keys (OSM only)
 """
 
+import logging
 from tunisia_business_scraper_v2 import TunisiaBusinessScraperV2
 
 def test_without_api_keys():
@@ -48,5 +49,7 @@ def test_without_api_keys():
         print("❌ No businesses found")
 
 if __name__ == "__main__":
+    # Scraper progress is logged; print it in line with this script's own output
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     test_without_api_keys()
 
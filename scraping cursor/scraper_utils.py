@@ -0,0 +1,69 @@
+"""
+Helpers shared by the Tunisia business scrapers: CSV output, JSON parsing and logging
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+import pandas as pd
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads  # optional, orjson parses the API responses faster
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = None  # optional, pandas writes the CSV when pyarrow is missing
+
+
+def write_csv(df: pd.DataFrame, filename: str, append: bool = False, header: bool = True):
+    """Write a DataFrame as UTF-8 CSV, with the vectorized pyarrow writer when available"""
+    if pa is not None:
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with open(filename, 'ab' if append else 'wb') as f:
+                pacsv.write_csv(table, f, write_options=pacsv.WriteOptions(include_header=header))
+            return
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            pass  # mixed-type object columns or old pyarrow, let pandas handle them
+    
+    df.to_csv(filename, mode='a' if append else 'w', header=header, index=False, encoding='utf-8')
+
+
+# Log records go through a queue and are written by a listener thread,
+# so concurrent scraping never waits on terminal output
+_log_queue = queue.Queue(-1)
+_log_listener = None
+_log_listener_lock = threading.Lock()
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    Print the application's log records to stdout through the listener thread.
+    Meant for a script's main(); library code only creates module loggers
+    """
+    global _log_listener
+    with _log_listener_lock:
+        if _log_listener is not None:
+            return
+        _log_listener = logging.handlers.QueueListener(_log_queue, logging.StreamHandler(sys.stdout))
+        _log_listener.start()
+        atexit.register(_log_listener.stop)
+    
+    root = logging.getLogger()
+    root.addHandler(logging.handlers.QueueHandler(_log_queue))
+    root.setLevel(level)
+
+
+def flush_logging():
+    """Wait until every queued log record is written, so print() output that follows stays in order"""
+    if _log_listener is not None:
+        _log_queue.join()
@@ -4,11 +4,72 @@ Tunisia Business Scraper using Overpass API
 Scrapes doctors, jewelry shops, and lawyers from OpenStreetMap data
 """
 
-import requests
+import aiohttp
+import asyncio
+import functools
+import logging
+import numpy as np
 import pandas as pd
 import time
-import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
+from aiohttp_client_cache import CachedSession
+from http_cache import api_cache
+from http_retry import retry_transient
+from scraper_utils import flush_logging, json_loads, setup_logging, write_csv
+
+
+logger = logging.getLogger(__name__)
+
+
+# Columns of the result DataFrame, in the order extract_business_info returns them
+FIELDS = (
+    'name', 'business_type', 'address', 'street', 'city', 'region', 'postcode',
+    'phone', 'email', 'website', 'latitude', 'longitude', 'osm_id', 'osm_type'
+)
+
+# Overpass tag filters for each business type
+TYPE_TAGS = {
+    'doctors': (('amenity', 'doctors'), ('healthcare', 'doctor')),
+    'jewelry': (('shop', 'jewelry'),),
+    'lawyers': (('office', 'lawyer'),)
+}
+
+# (tag, value) -> business type, checked in order
+CLASSIFY = {
+    ('amenity', 'doctors'): 'doctor',
+    ('healthcare', 'doctor'): 'doctor',
+    ('shop', 'jewelry'): 'jewelry',
+    ('office', 'lawyer'): 'lawyer'
+}
+ADDR_KEYS = ('addr:street', 'addr:city', 'addr:state', 'addr:postcode')
+
+# Low-cardinality columns stored as categoricals (integer codes instead of one string per row)
+_CATEGORY_COLUMNS = {'business_type': 'category', 'city': 'category', 'search_region': 'category'}
+
+
+@functools.lru_cache(maxsize=256)
+def _overpass_query(bbox: tuple, business_types: tuple) -> str:
+    """Overpass QL query for business types inside a bounding box, built once per combination"""
+    south, west, north, east = bbox
+    
+    # One line per tag, restricted to the region's bounding box so Overpass
+    # only returns candidates from that region
+    lines = [
+        f'  nwr["{key}"="{value}"]["name"]({south},{west},{north},{east});'
+        for business_type in business_types
+        for key, value in TYPE_TAGS.get(business_type, ())
+    ]
+    body = '\n'.join(lines)
+    
+    return f"""
+[out:json][timeout:300];
+(
+{body}
+);
+out center meta;
+"""
 
 
 class TunisiaBusinessScraper:
@@ -17,36 +78,55 @@ class TunisiaBusinessScraper:
     def __init__(self):
         self.base_url = "https://overpass-api.de/api/interpreter"
         self.headers = {
-            'User-Agent': 'Tunisia Business Scraper/1.0'
+            'User-Agent': 'Tunisia Business Scraper/1.0',
+            'Accept-Encoding': 'gzip, deflate'
         }
         
-        # Tunisian regions/cities for reference
+        # Overpass allows about 2 concurrent requests per client
+        self.max_concurrent_requests = 2
+        
+        # Overpass responses are kept on disk for a week, keyed by the query body
+        self.cache_file = os.path.join('.cache', 'tunisia_cache.sqlite')
+        self.cache_expire_after = 7 * 24 * 3600
+        self._request_slots = None
+        
+        # Tunisian regions/cities with the coordinates of their center
         self.regions = {
-            'Tunis': 'Tunis',
-            'Sfax': 'Sfax',
-            'Sousse': 'Sousse',
-            'Kairouan': 'Kairouan',
-            'Bizerte': 'Bizerte',
-            'Gabès': 'Gabès',
-            'Ariana': 'Ariana',
-            'Ben Arous': 'Ben Arous',
-            'Manouba': 'Manouba',
-            'Nabeul': 'Nabeul',
-            'Monastir': 'Monastir',
-            'Mahdia': 'Mahdia',
-            'Kasserine': 'Kasserine',
-            'Sidi Bouzid': 'Sidi Bouzid',
-            'Kef': 'Kef',
-            'Jendouba': 'Jendouba',
-            'Beja': 'Beja',
-            'Siliana': 'Siliana',
-            'Zaghouan': 'Zaghouan',
-            'Medenine': 'Medenine',
-            'Tataouine': 'Tataouine',
-            'Gafsa': 'Gafsa',
-            'Tozeur': 'Tozeur',
-            'Kebili': 'Kebili'
+            'Tunis': (36.8065, 10.1815),
+            'Sfax': (34.7406, 10.7603),
+            'Sousse': (35.8256, 10.6411),
+            'Kairouan': (35.6781, 10.0963),
+            'Bizerte': (37.2744, 9.8739),
+            'Gabès': (33.8881, 10.0972),
+            'Ariana': (36.8601, 10.1931),
+            'Ben Arous': (36.7531, 10.2189),
+            'Manouba': (36.8081, 10.0972),
+            'Nabeul': (36.4561, 10.7376),
+            'Monastir': (35.7781, 10.8262),
+            'Mahdia': (35.5047, 11.0442),
+            'Kasserine': (35.1678, 8.8361),
+            'Sidi Bouzid': (35.0381, 9.4847),
+            'Kef': (36.1822, 8.7147),
+            'Jendouba': (36.5011, 8.7803),
+            'Beja': (36.7256, 9.1814),
+            'Siliana': (36.0831, 9.3708),
+            'Zaghouan': (36.4019, 10.1428),
+            'Medenine': (33.3547, 10.5053),
+            'Tataouine': (32.9297, 10.4517),
+            'Gafsa': (34.4256, 8.7842),
+            'Tozeur': (33.9197, 8.1336),
+            'Kebili': (33.7042, 8.9694)
+        }
+        
+        # Bounding box (south, west, north, east) searched around each region center.
+        # Boxes of nearby regions overlap, e.g. the Tunis box covers Ariana, Ben Arous
+        # and Manouba, so each business is kept only for the region it is closest to
+        self.region_bbox = {
+            region: (round(lat - 0.2, 4), round(lon - 0.2, 4), round(lat + 0.2, 4), round(lon + 0.2, 4))
+            for region, (lat, lon) in self.regions.items()
         }
+        self._region_index = {region: i for i, region in enumerate(self.regions)}
+        self._region_centers = np.array(list(self.regions.values()))
     
     def build_overpass_query(self, region: str, business_types: List[str]) -> str:
         """
@@ -59,67 +139,57 @@ class TunisiaBusinessScraper:
         Returns:
             Overpass QL query string
         """
-        # Define the business type conditions
-        business_conditions = []
-        
-        for business_type in business_types:
-            if business_type == 'doctors':
-                business_conditions.append('(amenity=doctors or healthcare=doctor)')
-            elif business_type == 'jewelry':
-                business_conditions.append('shop=jewelry')
-            elif business_type == 'lawyers':
-                business_conditions.append('office=lawyer')
-        
-        # Combine conditions with OR
-        business_filter = ' or '.join(business_conditions)
-        
-        # Use country code TN for Tunisia and filter by region after fetching
-        # This is more reliable than city name filtering which can cause timeouts
-        query = f"""
-        [out:json][timeout:300];
-        (
-          node["{business_filter}"]["name"]["addr:country"="TN"];
-          way["{business_filter}"]["name"]["addr:country"="TN"];
-          relation["{business_filter}"]["name"]["addr:country"="TN"];
-        );
-        out center meta;
-        """
-        
-        return query
+        return _overpass_query(self.region_bbox[region], tuple(sorted(business_types)))
     
-    def make_request(self, query: str) -> Optional[Dict]:
+    async def make_request(self, session: aiohttp.ClientSession, query: str) -> Optional[List[tuple]]:
         """
         Make request to Overpass API with rate limiting
         
         Args:
+            session: aiohttp session to send the request with
             query: Overpass QL query string
             
         Returns:
-            JSON response or None if error
+            Named businesses from the response (see extract_business_info) or None if error
         """
-        try:
-            print(f"Making request to Overpass API...")
-            response = requests.post(
-                self.base_url,
-                data={'data': query},
-                headers=self.headers,
-                timeout=300
-            )
+        async with self._request_slots:
+            try:
+                logger.info(f"Making request to Overpass API...")
+                rows = await self._fetch_rows(session, query)
+                
+                # Rate limiting - be polite to the API
+                await asyncio.sleep(1)
+                
+                return rows
+                
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error making request: {e}")
+                return None
+            except ValueError as e:
+                logger.error(f"Error parsing JSON response: {e}")
+                return None
+    
+    @retry_transient
+    async def _fetch_rows(self, session: aiohttp.ClientSession, query: str) -> List[tuple]:
+        """Post one query and extract its named elements, retried on transient failures"""
+        # The cached session reads the whole body to store it, so it is parsed in one go
+        async with session.post(
+            self.base_url,
+            data={'data': query},
+            timeout=aiohttp.ClientTimeout(total=300)
+        ) as response:
             response.raise_for_status()
-            
-            # Rate limiting - be polite to the API
-            time.sleep(1)
-            
-            return response.json()
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error making request: {e}")
-            return None
-        except json.JSONDecodeError as e:
-            print(f"Error parsing JSON response: {e}")
-            return None
+            data = json_loads(await response.read())
+        
+        rows = []
+        for element in data.get('elements', []):
+            business_info = self.extract_business_info(element)
+            if business_info is not None:
+                rows.append(business_info)
+        
+        return rows
     
-    def extract_business_info(self, element: Dict) -> Dict:
+    def extract_business_info(self, element: Dict) -> Optional[tuple]:
         """
         Extract business information from OSM element
         
@@ -127,9 +197,12 @@ class TunisiaBusinessScraper:
             element: OSM element (node/way/relation)
             
         Returns:
-            Dictionary with business information
+            Tuple with business information, in FIELDS order, or None for unnamed elements
         """
         tags = element.get('tags', {})
+        name = tags.get('name')
+        if not name:  # Only include businesses with names
+            return None
         
         # Get coordinates
         lat, lon = None, None
@@ -139,40 +212,31 @@ class TunisiaBusinessScraper:
             lat, lon = element['center'].get('lat'), element['center'].get('lon')
         
         # Determine business type
-        business_type = 'unknown'
-        if tags.get('amenity') == 'doctors' or tags.get('healthcare') == 'doctor':
-            business_type = 'doctor'
-        elif tags.get('shop') == 'jewelry':
-            business_type = 'jewelry'
-        elif tags.get('office') == 'lawyer':
-            business_type = 'lawyer'
+        business_type = next((value for (key, tag), value in CLASSIFY.items() if tags.get(key) == tag), 'unknown')
         
         # Extract address components
-        street = tags.get('addr:street', '')
-        city = tags.get('addr:city', '')
-        region = tags.get('addr:state', '')
-        postcode = tags.get('addr:postcode', '')
+        address_parts = [tags.get(key, '') for key in ADDR_KEYS]
+        street, city, region, postcode = address_parts
         
         # Combine address
-        address_parts = [street, city, region, postcode]
         address = ', '.join([part for part in address_parts if part])
         
-        return {
-            'name': tags.get('name', ''),
-            'business_type': business_type,
-            'address': address,
-            'street': street,
-            'city': city,
-            'region': region,
-            'postcode': postcode,
-            'phone': tags.get('phone', ''),
-            'email': tags.get('email', ''),
-            'website': tags.get('website', ''),
-            'latitude': lat,
-            'longitude': lon,
-            'osm_id': element.get('id'),
-            'osm_type': element.get('type')
-        }
+        return (
+            name,
+            business_type,
+            address,
+            street,
+            city,
+            region,
+            postcode,
+            tags.get('phone', ''),
+            tags.get('email', ''),
+            tags.get('website', ''),
+            lat,
+            lon,
+            element.get('id'),
+            element.get('type')
+        )
     
     def scrape_businesses(self, region: str, business_types: List[str] = None) -> pd.DataFrame:
         """
@@ -182,50 +246,125 @@ class TunisiaBusinessScraper:
             region: Name of the region/city
             business_types: List of business types to scrape
             
+        Returns:
+            Pandas DataFrame with business data
+        """
+        return self._run(self.scrape_all_regions([region], business_types))[0]
+    
+    def scrape_regions(self, regions: List[str], business_types: List[str] = None) -> pd.DataFrame:
+        """
+        Scrape businesses for several regions concurrently, from synchronous code
+        
+        Args:
+            regions: Names of the regions/cities
+            business_types: List of business types to scrape
+            
+        Returns:
+            Pandas DataFrame with business data of all regions
+        """
+        frames = self._run(self.scrape_all_regions(regions, business_types))
+        df = pd.concat(frames, ignore_index=True)
+        if not df.empty:
+            # Businesses belong to their closest region, only the ones without
+            # coordinates can still come back for several regions.
+            # Categories differ per region, so concat falls back to strings
+            df = df.drop_duplicates(subset=['osm_type', 'osm_id']).astype(_CATEGORY_COLUMNS)
+        
+        return df
+    
+    def _run(self, coroutine):
+        """
+        Run a coroutine to completion from synchronous code
+        
+        Args:
+            coroutine: Coroutine to run
+            
+        Returns:
+            The coroutine's result
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from inside a running event loop (e.g. a notebook), where
+        # asyncio.run is not allowed: run the pipeline on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def scrape_all_regions(self, regions: List[str], business_types: List[str] = None) -> List[pd.DataFrame]:
+        """
+        Scrape businesses for several regions concurrently
+        
+        Args:
+            regions: Names of the regions/cities
+            business_types: List of business types to scrape
+            
+        Returns:
+            One Pandas DataFrame with business data per region
+        """
+        self._request_slots = asyncio.Semaphore(self.max_concurrent_requests)
+        
+        cache = api_cache(self.cache_file, self.cache_expire_after)
+        # One keep-alive connection pool for every query, headers set once
+        connector = aiohttp.TCPConnector(limit_per_host=self.max_concurrent_requests, keepalive_timeout=60)
+        async with CachedSession(cache=cache, connector=connector, headers=self.headers) as session:
+            return await asyncio.gather(
+                *[self.scrape_region(session, region, business_types) for region in regions]
+            )
+    
+    async def scrape_region(self, session: aiohttp.ClientSession, region: str,
+                            business_types: List[str] = None) -> pd.DataFrame:
+        """
+        Scrape businesses for a specific region with an open session
+        
+        Args:
+            session: aiohttp session to send requests with
+            region: Name of the region/city
+            business_types: List of business types to scrape
+            
         Returns:
             Pandas DataFrame with business data
         """
         if business_types is None:
             business_types = ['doctors', 'jewelry', 'lawyers']
         
-        print(f"Scraping businesses in {region}...")
-        print(f"Business types: {', '.join(business_types)}")
+        if region not in self.region_bbox:
+            logger.error(f"Unknown region '{region}'")
+            return pd.DataFrame(columns=FIELDS + ('search_region',))
+        
+        logger.info(f"Scraping businesses in {region}...")
+        logger.info(f"Business types: {', '.join(business_types)}")
         
         # Build and execute query
         query = self.build_overpass_query(region, business_types)
-        response = self.make_request(query)
+        rows = await self.make_request(session, query)
         
-        if not response:
-            print("Failed to get data from Overpass API")
+        if rows is None:
+            logger.error("Failed to get data from Overpass API")
             return pd.DataFrame()
         
-        # Extract business information
-        businesses = []
-        elements = response.get('elements', [])
+        # Build the DataFrame straight from the rows, without a list of dicts in between
+        df = pd.DataFrame.from_records(rows, columns=FIELDS)
+        df = df[self._closest_to_region(df, region)].reset_index(drop=True)
+        df = df.assign(search_region=region).astype(_CATEGORY_COLUMNS)
         
-        print(f"Found {len(elements)} elements in Tunisia")
-        
-        for element in elements:
-            business_info = self.extract_business_info(element)
-            if business_info['name']:  # Only include businesses with names
-                # Filter by region - check if the business is in the requested region
-                business_city = business_info.get('city', '').lower()
-                business_region = business_info.get('region', '').lower()
-                target_region = region.lower()
-                
-                # Check if the business is in the target region
-                if (target_region in business_city or 
-                    target_region in business_region or
-                    business_city in target_region or
-                    business_region in target_region):
-                    businesses.append(business_info)
+        logger.info(f"Extracted {len(df)} businesses in {region}")
         
-        print(f"Extracted {len(businesses)} businesses in {region}")
+        return df
+    
+    def _closest_to_region(self, df: pd.DataFrame, region: str) -> np.ndarray:
+        """Mask of the rows closer to this region's center than to any other, rows without coordinates included"""
+        lat = pd.to_numeric(df['latitude'], errors='coerce').to_numpy(float)
+        lon = pd.to_numeric(df['longitude'], errors='coerce').to_numpy(float)
+        centers = self._region_centers
         
-        # Convert to DataFrame
-        df = pd.DataFrame(businesses)
+        # Equirectangular distances are accurate enough to compare nearby centers
+        dlat = lat[:, None] - centers[:, 0]
+        dlon = (lon[:, None] - centers[:, 1]) * np.cos(np.radians(centers[:, 0]))
+        nearest = np.argmin(dlat ** 2 + dlon ** 2, axis=1) if len(df) else np.empty(0, dtype=int)
         
-        return df
+        return np.isnan(lat) | np.isnan(lon) | (nearest == self._region_index[region])
     
     def save_to_csv(self, df: pd.DataFrame, filename: str = None) -> str:
         """
@@ -242,8 +381,8 @@ class TunisiaBusinessScraper:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"tunisia_businesses_{timestamp}.csv"
         
-        df.to_csv(filename, index=False, encoding='utf-8')
-        print(f"Data saved to {filename}")
+        write_csv(df, filename)
+        logger.info(f"Data saved to {filename}")
         
         return filename
     
@@ -266,6 +405,7 @@ class TunisiaBusinessScraper:
 
 def main():
     """Main function to run the scraper"""
+    setup_logging()
     scraper = TunisiaBusinessScraper()
     
     # Display available regions
@@ -276,20 +416,24 @@ def main():
     # Get user input for region
     while True:
         try:
-            choice = input(f"\nEnter region name (or number 1-{len(scraper.regions)}): ").strip()
+            choice = input(f"\nEnter region name (or number 1-{len(scraper.regions)}, or 'all'): ").strip()
+            
+            if choice.lower() == 'all':
+                regions = list(scraper.regions.keys())
+                break
             
             # Check if it's a number
             if choice.isdigit():
                 choice_num = int(choice)
                 if 1 <= choice_num <= len(scraper.regions):
-                    region = list(scraper.regions.keys())[choice_num - 1]
+                    regions = [list(scraper.regions.keys())[choice_num - 1]]
                     break
                 else:
                     print("Invalid number. Please try again.")
             else:
                 # Check if it's a valid region name
                 if choice in scraper.regions:
-                    region = choice
+                    regions = [choice]
                     break
                 else:
                     print("Invalid region name. Please try again.")
@@ -297,7 +441,7 @@ def main():
             print("\nExiting...")
             return
     
-    print(f"\nSelected region: {region}")
+    print(f"\nSelected region: {', '.join(regions)}")
     
     # Ask for business types
     print("\nAvailable business types:")
@@ -320,18 +464,20 @@ def main():
             print("No valid business types selected. Using all types.")
             business_types = ['doctors', 'jewelry', 'lawyers']
     
-    # Scrape data
-    df = scraper.scrape_businesses(region, business_types)
+    # Scrape data, all selected regions at once
+    df = scraper.scrape_regions(regions, business_types)
     
     if not df.empty:
         # Save to CSV
         filename = scraper.save_to_csv(df)
         
-        # Display summary and first 10 rows
+        # Display summary and first 10 rows, after the queued log lines
+        flush_logging()
         scraper.display_summary(df)
         
         print(f"\nData has been saved to: {filename}")
     else:
+        flush_logging()
         print("No businesses found for the selected criteria.")
 
 
@@ -4,21 +4,49 @@ Tunisia Business Scraper V2 - Multiple Data Sources
 Uses Google Places API, SerpApi, and improved OpenStreetMap approaches
 """
 
-import requests
+import aiohttp
+import asyncio
+import functools
+import logging
 import pandas as pd
 import time
-import json
 from typing import List, Dict, Optional, Tuple
 import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
+from aiohttp_client_cache import CachedSession
+from http_cache import api_cache
+from http_retry import retry_transient
+from scraper_utils import flush_logging, json_loads, setup_logging, write_csv
+
+
+logger = logging.getLogger(__name__)
+
+# Low-cardinality columns stored as categoricals (integer codes instead of one string per row)
+_CATEGORY_COLUMNS = {'business_type': 'category', 'city': 'category'}
 
 
 class TunisiaBusinessScraperV2:
     """Enhanced scraper using multiple data sources"""
     
+    # OpenStreetMap tags for each business type
+    _OSM_TAGS = {
+        'doctors': (('amenity', 'doctors'), ('healthcare', 'doctor'), ('healthcare', 'clinic')),
+        'jewelry': (('shop', 'jewelry'), ('shop', 'watches')),
+        'lawyers': (('office', 'lawyer'), ('office', 'attorney'), ('office', 'legal_services'))
+    }
+    
     def __init__(self, google_api_key: str = None, serpapi_key: str = None):
         self.google_api_key = google_api_key or os.getenv('GOOGLE_PLACES_API_KEY')
         self.serpapi_key = serpapi_key or os.getenv('SERPAPI_KEY')
+        self.headers = {
+            'User-Agent': 'Tunisia Business Scraper/2.0',
+            'Accept-Encoding': 'gzip, deflate'
+        }
+        
+        # API responses are kept on disk for a week, keyed by URL, params and body
+        self.cache_file = os.path.join('.cache', 'tunisia_cache.sqlite')
+        self.cache_expire_after = 7 * 24 * 3600
         
         # Tunisian cities with coordinates
         self.tunisia_cities = {
@@ -55,11 +83,13 @@ class TunisiaBusinessScraperV2:
             'lawyers': ['lawyer', 'attorney', 'legal_services']
         }
     
-    def scrape_google_places(self, city: str, business_type: str, radius: int = 5000) -> List[Dict]:
+    async def scrape_google_places(self, session: aiohttp.ClientSession, city: str, business_type: str,
+                                   radius: int = 5000) -> List[Dict]:
         """
         Scrape using Google Places API
         
         Args:
+            session: Shared aiohttp session
             city: Name of the city
             business_type: Type of business to search for
             radius: Search radius in meters
@@ -68,21 +98,21 @@ class TunisiaBusinessScraperV2:
             List of business dictionaries
         """
         if not self.google_api_key:
-            print("❌ Google Places API key not provided. Set GOOGLE_PLACES_API_KEY environment variable.")
+            logger.warning("❌ Google Places API key not provided. Set GOOGLE_PLACES_API_KEY environment variable.")
             return []
         
         if city not in self.tunisia_cities:
-            print(f"❌ City '{city}' not found in Tunisia cities list")
+            logger.error(f"❌ City '{city}' not found in Tunisia cities list")
             return []
         
         lat, lng = self.tunisia_cities[city]
-        businesses = []
+        basics = []
         
         # Get search terms for the business type
         search_terms = self.business_types.get(business_type, [business_type])
         
         for search_term in search_terms:
-            print(f"🔍 Searching for '{search_term}' in {city}...")
+            logger.debug(f"🔍 Searching for '{search_term}' in {city}...")
             
             # Use Text Search API for better results
             url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
@@ -94,44 +124,42 @@ class TunisiaBusinessScraperV2:
             }
             
             try:
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
+                data = await self._request_json(session, 'GET', url, params=params)
                 
                 if data.get('status') == 'OK':
                     for place in data.get('results', []):
-                        business = self._extract_google_place_info(place, business_type, city)
+                        business = self._extract_basic(place, business_type, city)
                         if business:
-                            businesses.append(business)
+                            basics.append((business, place.get('place_id')))
                     
-                    print(f"✅ Found {len(data.get('results', []))} places for '{search_term}'")
+                    logger.debug(f"✅ Found {len(data.get('results', []))} places for '{search_term}'")
                 else:
-                    print(f"❌ API Error: {data.get('error_message', 'Unknown error')}")
+                    logger.error(f"❌ API Error: {data.get('error_message', 'Unknown error')}")
                 
                 # Rate limiting
-                time.sleep(0.1)
+                await asyncio.sleep(0.1)
                 
             except Exception as e:
-                print(f"❌ Error searching for '{search_term}': {e}")
+                logger.error(f"❌ Error searching for '{search_term}': {e}")
         
-        return businesses
+        # Look up the details of all found places at once, 10 requests at a time
+        sem = asyncio.Semaphore(10)
+        return await asyncio.gather(
+            *[self._enrich_with_details(session, sem, business, place_id) for business, place_id in basics]
+        )
     
-    def _extract_google_place_info(self, place: Dict, business_type: str, city: str) -> Dict:
-        """Extract business information from Google Places API response"""
+    def _extract_basic(self, place: Dict, business_type: str, city: str) -> Dict:
+        """Extract business information from Google Places API response, without place details"""
         try:
-            # Get place details for more information
-            place_id = place.get('place_id')
-            details = self._get_place_details(place_id) if place_id else {}
-            
             return {
                 'name': place.get('name', ''),
                 'business_type': business_type,
                 'address': place.get('formatted_address', ''),
                 'city': city,
                 'region': 'Tunisia',
-                'phone': details.get('formatted_phone_number', ''),
-                'email': details.get('email', ''),
-                'website': details.get('website', ''),
+                'phone': '',
+                'email': '',
+                'website': '',
                 'latitude': place['geometry']['location']['lat'],
                 'longitude': place['geometry']['location']['lng'],
                 'rating': place.get('rating', ''),
@@ -140,10 +168,23 @@ class TunisiaBusinessScraperV2:
                 'data_source': 'Google Places API'
             }
         except Exception as e:
-            print(f"❌ Error extracting place info: {e}")
+            logger.error(f"❌ Error extracting place info: {e}")
             return None
     
-    def _get_place_details(self, place_id: str) -> Dict:
+    async def _enrich_with_details(self, session: aiohttp.ClientSession, sem: asyncio.Semaphore,
+                                   business: Dict, place_id: Optional[str]) -> Dict:
+        """Fill in phone, email and website from the place details"""
+        if place_id:
+            async with sem:
+                details = await self._get_place_details(session, place_id)
+            
+            business['phone'] = details.get('formatted_phone_number', '')
+            business['email'] = details.get('email', '')
+            business['website'] = details.get('website', '')
+        
+        return business
+    
+    async def _get_place_details(self, session: aiohttp.ClientSession, place_id: str) -> Dict:
         """Get detailed information for a place"""
         if not place_id or not self.google_api_key:
             return {}
@@ -157,22 +198,21 @@ class TunisiaBusinessScraperV2:
         }
         
         try:
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            data = await self._request_json(session, 'GET', url, params=params)
             
             if data.get('status') == 'OK':
                 return data.get('result', {})
         except Exception as e:
-            print(f"❌ Error getting place details: {e}")
+            logger.error(f"❌ Error getting place details: {e}")
         
         return {}
     
-    def scrape_serpapi(self, city: str, business_type: str) -> List[Dict]:
+    async def scrape_serpapi(self, session: aiohttp.ClientSession, city: str, business_type: str) -> List[Dict]:
         """
         Scrape using SerpApi (requires API key)
         
         Args:
+            session: Shared aiohttp session
             city: Name of the city
             business_type: Type of business to search for
             
@@ -180,7 +220,7 @@ class TunisiaBusinessScraperV2:
             List of business dictionaries
         """
         if not self.serpapi_key:
-            print("❌ SerpApi key not provided. Set SERPAPI_KEY environment variable.")
+            logger.warning("❌ SerpApi key not provided. Set SERPAPI_KEY environment variable.")
             return []
         
         businesses = []
@@ -203,23 +243,28 @@ class TunisiaBusinessScraperV2:
         }
         
         try:
-            print(f"🔍 Searching SerpApi for '{query}'...")
-            response = requests.get(url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
+            logger.info(f"🔍 Searching SerpApi for '{query}'...")
+            data = await self._request_json(session, 'GET', url, params=params)
             
             for result in data.get('local_results', []):
                 business = self._extract_serpapi_info(result, business_type, city)
                 if business:
                     businesses.append(business)
             
-            print(f"✅ Found {len(businesses)} businesses via SerpApi")
+            logger.info(f"✅ Found {len(businesses)} businesses via SerpApi")
             
         except Exception as e:
-            print(f"❌ SerpApi error: {e}")
+            logger.error(f"❌ SerpApi error: {e}")
         
         return businesses
     
+    @retry_transient
+    async def _request_json(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs) -> Dict:
+        """Send a request and parse its JSON body, retried on transient failures"""
+        async with session.request(method, url, **kwargs) as response:
+            response.raise_for_status()
+            return json_loads(await response.read())
+    
     def _extract_serpapi_info(self, result: Dict, business_type: str, city: str) -> Dict:
         """Extract business information from SerpApi response"""
         try:
@@ -239,75 +284,82 @@ class TunisiaBusinessScraperV2:
                 'data_source': 'SerpApi'
             }
         except Exception as e:
-            print(f"❌ Error extracting SerpApi info: {e}")
+            logger.error(f"❌ Error extracting SerpApi info: {e}")
             return None
     
-    def scrape_improved_osm(self, city: str, business_type: str) -> List[Dict]:
+    def build_combined_query(self, business_types: List[str]) -> str:
+        """Build one Overpass query for all the given business types"""
+        return self._combined_query(tuple(sorted(business_types)))
+    
+    @classmethod
+    @functools.lru_cache(maxsize=None)
+    def _combined_query(cls, business_types: tuple) -> str:
+        """Overpass query for a sorted tuple of business types, built once per combination"""
+        lines = [
+            f'  node["{key}"="{value}"]["name"]["addr:country"="TN"];'
+            for business_type in business_types
+            for key, value in cls._OSM_TAGS.get(business_type, ())
+        ]
+        if not lines:
+            return ''
+        
+        body = '\n'.join(lines)
+        return f"""
+[out:json][timeout:60];
+(
+{body}
+);
+out center meta;
+"""
+    
+    async def scrape_improved_osm(self, session: aiohttp.ClientSession, city: str,
+                                  business_types: List[str]) -> List[Dict]:
         """
-        Improved OpenStreetMap scraping using better queries
+        Improved OpenStreetMap scraping, one query for all business types
         
         Args:
+            session: Shared aiohttp session
             city: Name of the city
-            business_type: Type of business to search for
+            business_types: Types of business to search for
             
         Returns:
             List of business dictionaries
         """
         businesses = []
         
-        # Better Overpass queries for Tunisia
-        queries = {
-            'doctors': f"""
-            [out:json][timeout:60];
-            (
-              node["amenity"="doctors"]["name"]["addr:country"="TN"];
-              node["healthcare"="doctor"]["name"]["addr:country"="TN"];
-              node["healthcare"="clinic"]["name"]["addr:country"="TN"];
-            );
-            out center meta;
-            """,
-            'jewelry': f"""
-            [out:json][timeout:60];
-            (
-              node["shop"="jewelry"]["name"]["addr:country"="TN"];
-              node["shop"="watches"]["name"]["addr:country"="TN"];
-            );
-            out center meta;
-            """,
-            'lawyers': f"""
-            [out:json][timeout:60];
-            (
-              node["office"="lawyer"]["name"]["addr:country"="TN"];
-              node["office"="attorney"]["name"]["addr:country"="TN"];
-              node["office"="legal_services"]["name"]["addr:country"="TN"];
-            );
-            out center meta;
-            """
-        }
-        
-        query = queries.get(business_type)
+        query = self.build_combined_query(business_types)
         if not query:
             return businesses
         
+        # Tells which business type each returned element was matched for
+        type_by_tag = {
+            tag: business_type
+            for business_type in business_types
+            for tag in self._OSM_TAGS.get(business_type, ())
+        }
+        
         try:
-            print(f"🔍 Searching OpenStreetMap for {business_type} in Tunisia...")
-            response = requests.post(
-                "https://overpass-api.de/api/interpreter",
+            logger.info(f"🔍 Searching OpenStreetMap for {', '.join(business_types)} in Tunisia...")
+            data = await self._request_json(
+                session, 'POST', "https://overpass-api.de/api/interpreter",
                 data={'data': query},
-                timeout=60
+                timeout=aiohttp.ClientTimeout(total=60)
             )
-            response.raise_for_status()
-            data = response.json()
             
             for element in data.get('elements', []):
+                tags = element.get('tags', {})
+                business_type = next((type_by_tag[tag] for tag in tags.items() if tag in type_by_tag), None)
+                if business_type is None:
+                    continue
+                
                 business = self._extract_osm_info(element, business_type, city)
                 if business and self._is_in_city(business, city):
                     businesses.append(business)
             
-            print(f"✅ Found {len(businesses)} {business_type} in {city} via OSM")
+            logger.info(f"✅ Found {len(businesses)} businesses in {city} via OSM")
             
         except Exception as e:
-            print(f"❌ OSM error: {e}")
+            logger.error(f"❌ OSM error: {e}")
         
         return businesses
     
@@ -337,7 +389,7 @@ class TunisiaBusinessScraperV2:
                 'data_source': 'OpenStreetMap'
             }
         except Exception as e:
-            print(f"❌ Error extracting OSM info: {e}")
+            logger.error(f"❌ Error extracting OSM info: {e}")
             return None
     
     def _is_in_city(self, business: Dict, target_city: str) -> bool:
@@ -351,7 +403,7 @@ class TunisiaBusinessScraperV2:
     
     def scrape_all_sources(self, city: str, business_types: List[str]) -> pd.DataFrame:
         """
-        Scrape from all available sources
+        Scrape from all available sources, from synchronous code
         
         Args:
             city: Name of the city
@@ -360,53 +412,90 @@ class TunisiaBusinessScraperV2:
         Returns:
             Combined DataFrame with all results
         """
-        all_businesses = []
+        return self._run(self.scrape_all_sources_async(city, business_types))
+    
+    def _run(self, coroutine):
+        """
+        Run a coroutine to completion from synchronous code
         
-        for business_type in business_types:
-            print(f"\n🔍 Scraping {business_type} in {city}...")
+        Args:
+            coroutine: Coroutine to run
             
-            # Try Google Places API first (most reliable)
-            if self.google_api_key:
-                google_results = self.scrape_google_places(city, business_type)
-                all_businesses.extend(google_results)
+        Returns:
+            The coroutine's result
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from inside a running event loop (e.g. a notebook), where
+        # asyncio.run is not allowed: run the pipeline on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    async def scrape_all_sources_async(self, city: str, business_types: List[str]) -> pd.DataFrame:
+        """
+        Scrape from all available sources, all sources and business types at once
+        
+        Args:
+            city: Name of the city
+            business_types: List of business types to scrape
             
-            # Try SerpApi if available
-            if self.serpapi_key:
-                serpapi_results = self.scrape_serpapi(city, business_type)
-                all_businesses.extend(serpapi_results)
+        Returns:
+            Combined DataFrame with all results
+        """
+        all_businesses = []
+        
+        # One cached session for every call so connections are reused
+        cache = api_cache(self.cache_file, self.cache_expire_after)
+        connector = aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=60)
+        async with CachedSession(cache=cache, connector=connector, headers=self.headers,
+                                 timeout=aiohttp.ClientTimeout(total=30)) as session:
+            tasks = []
+            for business_type in business_types:
+                logger.info(f"🔍 Scraping {business_type} in {city}...")
+                
+                # Google Places API (most reliable)
+                if self.google_api_key:
+                    tasks.append(self.scrape_google_places(session, city, business_type))
+                
+                # SerpApi if available
+                if self.serpapi_key:
+                    tasks.append(self.scrape_serpapi(session, city, business_type))
             
-            # Always try OpenStreetMap as fallback
-            osm_results = self.scrape_improved_osm(city, business_type)
-            all_businesses.extend(osm_results)
+            # Always try OpenStreetMap as fallback, one query for every type
+            tasks.append(self.scrape_improved_osm(session, city, business_types))
             
-            # Rate limiting between business types
-            time.sleep(1)
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"❌ Source error: {result}")
+            else:
+                all_businesses.extend(result)
         
         # Remove duplicates based on name and coordinates
-        unique_businesses = self._remove_duplicates(all_businesses)
+        df = self._remove_duplicates(pd.DataFrame(all_businesses))
+        if not df.empty:
+            df = df.astype(_CATEGORY_COLUMNS)
         
-        print(f"\n✅ Total unique businesses found: {len(unique_businesses)}")
+        logger.info(f"✅ Total unique businesses found: {len(df)}")
         
-        return pd.DataFrame(unique_businesses)
+        return df
     
-    def _remove_duplicates(self, businesses: List[Dict]) -> List[Dict]:
+    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
         """Remove duplicate businesses based on name and coordinates"""
-        seen = set()
-        unique = []
-        
-        for business in businesses:
-            # Create a key based on name and coordinates
-            key = (
-                business.get('name', '').lower().strip(),
-                round(business.get('latitude', 0), 4),
-                round(business.get('longitude', 0), 4)
-            )
-            
-            if key not in seen:
-                seen.add(key)
-                unique.append(business)
-        
-        return unique
+        if df.empty:
+            return df
+        
+        # Key on name and coordinates rounded to ~10 m, missing coordinates compare equal
+        keys = ['_k', '_la', '_lo']
+        return df.assign(
+            _k=df['name'].fillna('').str.lower().str.strip(),
+            _la=pd.to_numeric(df['latitude'], errors='coerce').round(4),
+            _lo=pd.to_numeric(df['longitude'], errors='coerce').round(4)
+        ).drop_duplicates(keys).drop(columns=keys).reset_index(drop=True)
     
     def save_to_csv(self, df: pd.DataFrame, filename: str = None) -> str:
         """Save DataFrame to CSV file"""
@@ -414,8 +503,8 @@ class TunisiaBusinessScraperV2:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"tunisia_businesses_v2_{timestamp}.csv"
         
-        df.to_csv(filename, index=False, encoding='utf-8')
-        print(f"💾 Data saved to {filename}")
+        write_csv(df, filename)
+        logger.info(f"💾 Data saved to {filename}")
         return filename
     
     def display_summary(self, df: pd.DataFrame):
@@ -441,6 +530,7 @@ class TunisiaBusinessScraperV2:
 
 def main():
     """Main function"""
+    setup_logging()
     print("🇹🇳 Tunisia Business Scraper V2 - Multiple Data Sources")
     print("=" * 60)
     
@@ -488,11 +578,13 @@ def main():
     df = scraper.scrape_all_sources(city, business_types)
     
     if not df.empty:
-        # Save and display results
+        # Save and display results, after the queued log lines
         filename = scraper.save_to_csv(df)
+        flush_logging()
         scraper.display_summary(df)
         print(f"\n🎉 Scraping completed! Data saved to: {filename}")
     else:
+        flush_logging()
         print("❌ No businesses found. Try a different city or check your API keys.")
 
 
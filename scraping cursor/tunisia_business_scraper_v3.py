@@ -2,14 +2,18 @@
 """
 Tunisia Business Scraper V3 - SUPERCHARGED VERSION
 Gets HUNDREDS of results using multiple strategies
+Requires Python 3.10+
 """
 
-import requests
+import asyncio
+import aiohttp
+import functools
+from dataclasses import asdict, dataclass
 import pandas as pd
 import time
-import json
 from typing import List, Dict, Optional, Tuple
 import os
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import quote
 import random
 from selenium import webdriver
@@ -18,7 +22,66 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+import lxml.html
 import re
+from http_retry import retry_transient
+from scraper_utils import json_loads, write_csv
+
+
+# Tunisian numbers are 8 digits, optionally behind a +216 / 00216 country code
+_TN_PHONE_RE = re.compile(r'^(?:(?:\+|00)?216)?[\s.-]*(\d{2})[\s.-]*(\d{3})[\s.-]*(\d{3})$')
+
+
+def _normalize_phone(raw: str) -> str:
+    """Format a Tunisian number as +216 XX XXX XXX, leaving anything else as given"""
+    raw = (raw or '').strip()
+    match = _TN_PHONE_RE.match(raw)
+    if match is None:
+        return raw
+    return '+216 {} {} {}'.format(*match.groups())
+
+
+@dataclass(frozen=True, slots=True)
+class SearchPlan:
+    """Precomputed search terms and OSM filters for one business type"""
+    google_terms: tuple
+    selenium_terms: tuple
+    serpapi_terms: tuple
+    osm_filters: tuple
+
+
+_EMPTY_PLAN = SearchPlan((), (), (), ())
+
+
+@dataclass(frozen=True, slots=True)
+class HostLimits:
+    """Per-host concurrency caps of one scraping run, bound to that run's event loop"""
+    google: asyncio.Semaphore
+    serpapi: asyncio.Semaphore
+    overpass: asyncio.Semaphore
+    
+    @classmethod
+    def create(cls) -> 'HostLimits':
+        # Overpass rate limits much harder than Google
+        return cls(google=asyncio.Semaphore(8), serpapi=asyncio.Semaphore(8), overpass=asyncio.Semaphore(2))
+
+
+@dataclass(slots=True)
+class Business:
+    """One scraped business; every source fills in the fields it has"""
+    name: str = ""
+    business_type: str = ""
+    address: str = ""
+    city: str = ""
+    region: str = ""
+    phone: str = ""
+    email: str = ""
+    website: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    rating: Optional[float] = None
+    user_ratings_total: Optional[int] = None
+    data_source: str = ""
 
 
 class TunisiaBusinessScraperV3:
@@ -29,6 +92,12 @@ class TunisiaBusinessScraperV3:
         self.serpapi_key = serpapi_key or os.getenv('SERPAPI_KEY')
         self.use_selenium = use_selenium
         
+        # Sent with every API request; each run opens one pooled aiohttp session
+        self.headers = {'User-Agent': 'TunisiaScraper/3.0'}
+        
+        # Headless Chrome is started on first use and shared by every Selenium search
+        self._driver = None
+        
         # Tunisian cities with coordinates and search terms
         self.tunisia_cities = {
             'Tunis': {
@@ -133,26 +202,57 @@ class TunisiaBusinessScraperV3:
         self.business_types = {
             'doctors': {
                 'google_terms': ['doctor', 'hospital', 'health', 'medical_center', 'clinic', 'physician', 'médecin', 'طبيب'],
-                'search_terms': ['doctor', 'médecin', 'طبيب', 'hospital', 'hôpital', 'مستشفى', 'clinic', 'clinique', 'عيادة', 'medical', 'médical', 'صحة']
+                'search_terms': ['doctor', 'médecin', 'طبيب', 'hospital', 'hôpital', 'مستشفى', 'clinic', 'clinique', 'عيادة', 'medical', 'médical', 'صحة'],
+                'osm_filters': [
+                    'node["amenity"="doctors"]["name"]["addr:country"="TN"];',
+                    'node["healthcare"="doctor"]["name"]["addr:country"="TN"];',
+                    'node["healthcare"="clinic"]["name"]["addr:country"="TN"];',
+                    'node["healthcare"="hospital"]["name"]["addr:country"="TN"];',
+                    'node["office"="doctor"]["name"]["addr:country"="TN"];',
+                    'node["office"="medical"]["name"]["addr:country"="TN"];'
+                ]
             },
             'jewelry': {
                 'google_terms': ['jewelry_store', 'jewelry', 'jeweler', 'bijouterie', 'مجوهرات'],
-                'search_terms': ['jewelry', 'bijouterie', 'مجوهرات', 'jeweler', 'bijoutier', 'صائغ', 'gold', 'or', 'ذهب', 'silver', 'argent', 'فضة']
+                'search_terms': ['jewelry', 'bijouterie', 'مجوهرات', 'jeweler', 'bijoutier', 'صائغ', 'gold', 'or', 'ذهب', 'silver', 'argent', 'فضة'],
+                'osm_filters': [
+                    'node["shop"="jewelry"]["name"]["addr:country"="TN"];',
+                    'node["shop"="watches"]["name"]["addr:country"="TN"];',
+                    'node["shop"="gold"]["name"]["addr:country"="TN"];',
+                    'node["craft"="jeweller"]["name"]["addr:country"="TN"];'
+                ]
             },
             'lawyers': {
                 'google_terms': ['lawyer', 'attorney', 'legal_services', 'avocat', 'محامي'],
-                'search_terms': ['lawyer', 'avocat', 'محامي', 'attorney', 'legal', 'juridique', 'قانوني', 'court', 'tribunal', 'محكمة']
+                'search_terms': ['lawyer', 'avocat', 'محامي', 'attorney', 'legal', 'juridique', 'قانوني', 'court', 'tribunal', 'محكمة'],
+                'osm_filters': [
+                    'node["office"="lawyer"]["name"]["addr:country"="TN"];',
+                    'node["office"="attorney"]["name"]["addr:country"="TN"];',
+                    'node["office"="legal_services"]["name"]["addr:country"="TN"];',
+                    'node["office"="notary"]["name"]["addr:country"="TN"];'
+                ]
             }
         }
-    
-    def scrape_google_places_enhanced(self, city: str, business_type: str) -> List[Dict]:
-        """Enhanced Google Places scraping with multiple search strategies"""
-        if not self.google_api_key:
-            return []
         
-        businesses = []
+        # Per-type search plans, sliced once instead of on every scrape call
+        self._plans = {
+            business_type: SearchPlan(
+                google_terms=tuple(info['search_terms']),
+                selenium_terms=tuple(info['search_terms'][:5]),  # Limit to 5 searches
+                serpapi_terms=tuple(info['search_terms'][:3]),  # Limit to 3 searches
+                osm_filters=tuple(info['osm_filters'])
+            )
+            for business_type, info in self.business_types.items()
+        }
+        
+        # The city and business type tables never change, so cache per instance
+        self._build_google_queries = functools.lru_cache(maxsize=None)(self._build_google_queries)
+        self._build_selenium_queries = functools.lru_cache(maxsize=None)(self._build_selenium_queries)
+    
+    def _build_google_queries(self, city: str, business_type: str) -> Tuple[Tuple[str, Dict], ...]:
+        """Build the (url, params) pairs for the Google Places text searches of one city and type"""
         city_info = self.tunisia_cities.get(city, {})
-        search_terms = self.business_types.get(business_type, {}).get('search_terms', [])
+        search_terms = list(self._plans.get(business_type, _EMPTY_PLAN).google_terms)
         
         # Add city-specific search terms
         city_search_terms = city_info.get('search_terms', [])
@@ -161,43 +261,42 @@ class TunisiaBusinessScraperV3:
         all_search_terms = search_terms + [f"{term} {city}" for term in search_terms[:3]]
         all_search_terms += [f"{term} {city_term}" for term in search_terms[:2] for city_term in city_search_terms[:2]]
         
-        print(f"🔍 Searching with {len(all_search_terms)} different terms...")
-        
-        for i, search_term in enumerate(all_search_terms[:10]):  # Limit to 10 searches
-            print(f"  {i+1}/10: '{search_term}'")
-            
-            # Use Text Search API
-            url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-            params = {
-                'query': f'{search_term} in {city}, Tunisia',
-                'key': self.google_api_key,
-                'region': 'tn'
-            }
+        url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
+        return tuple(
+            (url, {'query': f'{search_term} in {city}, Tunisia', 'key': self.google_api_key, 'region': 'tn'})
+            for search_term in all_search_terms[:10]  # Limit to 10 searches
+        )
+    
+    def _build_selenium_queries(self, city: str, business_type: str) -> Tuple[Tuple[str, str], ...]:
+        """Build the (search query, Google Maps URL) pairs for the Selenium searches of one city and type"""
+        queries = []
+        for search_term in self._plans.get(business_type, _EMPTY_PLAN).selenium_terms:
+            search_query = f"{search_term} in {city}, Tunisia"
+            queries.append((search_query, f"https://www.google.com/maps/search/{quote(search_query)}"))
+        return tuple(queries)
+    
+    def scrape_google_places_enhanced(self, city: str, business_type: str) -> List[Business]:
+        """Enhanced Google Places scraping with multiple search strategies"""
+        return self._run(self._run_source(self._async_google_places, city, business_type))
+    
+    @property
+    def driver(self):
+        """Shared headless Chrome driver, launched lazily"""
+        if self._driver is None:
+            # Setup Chrome options
+            chrome_options = Options()
+            chrome_options.add_argument('--headless')
+            chrome_options.add_argument('--no-sandbox')
+            chrome_options.add_argument('--disable-dev-shm-usage')
+            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+            # Return from driver.get() once the DOM is parsed; explicit waits cover the rest
+            chrome_options.set_capability('pageLoadStrategy', 'eager')
             
-            try:
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                if data.get('status') == 'OK':
-                    for place in data.get('results', []):
-                        business = self._extract_google_place_info(place, business_type, city)
-                        if business:
-                            businesses.append(business)
-                
-                # Rate limiting
-                time.sleep(0.2)
-                
-            except Exception as e:
-                print(f"    ❌ Error: {e}")
+            self._driver = webdriver.Chrome(options=chrome_options)
         
-        # Remove duplicates
-        businesses = self._remove_duplicates(businesses)
-        print(f"✅ Found {len(businesses)} unique {business_type} via Google Places")
-        
-        return businesses
+        return self._driver
     
-    def scrape_google_maps_selenium(self, city: str, business_type: str) -> List[Dict]:
+    def scrape_google_maps_selenium(self, city: str, business_type: str) -> List[Business]:
         """Scrape Google Maps directly using Selenium for maximum results"""
         if not self.use_selenium:
             return []
@@ -205,371 +304,406 @@ class TunisiaBusinessScraperV3:
         businesses = []
         
         try:
-            # Setup Chrome options
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
-            
-            driver = webdriver.Chrome(options=chrome_options)
-            
-            search_terms = self.business_types.get(business_type, {}).get('search_terms', [])
+            driver = self.driver
             
-            for search_term in search_terms[:5]:  # Limit to 5 searches
-                print(f"🌐 Selenium search: '{search_term} in {city}, Tunisia'")
+            for search_query, url in self._build_selenium_queries(city, business_type):
+                print(f"🌐 Selenium search: '{search_query}'")
                 
                 try:
                     # Search on Google Maps
-                    search_query = f"{search_term} in {city}, Tunisia"
-                    driver.get(f"https://www.google.com/maps/search/{quote(search_query)}")
+                    driver.get(url)
                     
-                    # Wait for results to load
-                    time.sleep(3)
+                    # Wait for the results list to load
+                    feed = WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, '[role="feed"]'))
+                    )
                     
                     # Scroll to load more results
-                    for _ in range(3):
-                        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                        time.sleep(2)
+                    self._scroll_feed(driver, feed)
                     
-                    # Extract business information
-                    business_elements = driver.find_elements(By.CSS_SELECTOR, '[data-result-index]')
+                    # Extract business information from one snapshot of the page, parsed locally
+                    tree = lxml.html.fromstring(driver.page_source)
+                    # Only place links; the website/directions buttons in a card carry aria-labels too
+                    business_elements = tree.xpath('//div[@role="feed"]//a[@aria-label][contains(@href, "/maps/place/")]')
                     
                     for element in business_elements:
-                        try:
-                            business = self._extract_selenium_business_info(element, business_type, city)
-                            if business:
-                                businesses.append(business)
-                        except Exception as e:
-                            continue
+                        business = self._extract_selenium_business_info(element, business_type, city)
+                        if business:
+                            businesses.append(business)
                     
                     print(f"  ✅ Found {len(business_elements)} elements")
                     
+                except TimeoutException:
+                    print("  ❌ Selenium error: no results list appeared")
                 except Exception as e:
                     print(f"  ❌ Selenium error: {e}")
                 
                 time.sleep(2)  # Rate limiting
             
-            driver.quit()
-            
         except Exception as e:
             print(f"❌ Selenium setup error: {e}")
         
-        # Remove duplicates
-        businesses = self._remove_duplicates(businesses)
-        print(f"✅ Found {len(businesses)} unique {business_type} via Selenium")
+        print(f"✅ Found {len(businesses)} {business_type} via Selenium")
         
         return businesses
     
-    def _extract_selenium_business_info(self, element, business_type: str, city: str) -> Dict:
-        """Extract business info from Selenium element"""
-        try:
-            # Click on the element to get more details
-            element.click()
-            time.sleep(1)
-            
-            # Extract information
-            name = ""
-            address = ""
-            phone = ""
-            website = ""
-            
-            try:
-                name_element = element.find_element(By.CSS_SELECTOR, 'h1, [data-value="Directions"]')
-                name = name_element.text
-            except:
-                pass
-            
-            try:
-                address_element = element.find_element(By.CSS_SELECTOR, '[data-item-id="address"]')
-                address = address_element.text
-            except:
-                pass
-            
-            try:
-                phone_element = element.find_element(By.CSS_SELECTOR, '[data-item-id*="phone"]')
-                phone = phone_element.text
-            except:
-                pass
-            
-            try:
-                website_element = element.find_element(By.CSS_SELECTOR, '[data-item-id*="website"]')
-                website = website_element.text
-            except:
-                pass
-            
-            if name:
-                return {
-                    'name': name,
-                    'business_type': business_type,
-                    'address': address,
-                    'city': city,
-                    'region': 'Tunisia',
-                    'phone': phone,
-                    'website': website,
-                    'data_source': 'Selenium Google Maps'
-                }
+    def _scroll_feed(self, driver, feed, timeout: float = 10, poll: float = 0.5):
+        """Scroll the results feed until its height stops growing or the timeout runs out"""
+        deadline = time.monotonic() + timeout
+        last_height = None
+        
+        while time.monotonic() < deadline:
+            height = driver.execute_script(
+                "arguments[0].scrollTop = arguments[0].scrollHeight; return arguments[0].scrollHeight;", feed
+            )
+            if height == last_height:
+                break
+            last_height = height
+            time.sleep(poll)
+    
+    def _extract_selenium_business_info(self, element, business_type: str, city: str) -> Optional[Business]:
+        """Extract business info from a result link in the parsed Google Maps page"""
+        name = element.get('aria-label', '').strip()
+        if not name:
+            return None
         
-        except Exception as e:
-            pass
+        # The link's parent is the result card holding the other details
+        card = element.getparent()
+        phone = card.xpath('string(.//span[contains(@class, "UsdlK")])').strip()
+        website = card.xpath('string(.//a[@data-value="Website"]/@href)').strip()
+        
+        return Business(
+            name=name,
+            business_type=business_type,
+            address=self._card_address(card),
+            city=city,
+            region='Tunisia',
+            phone=_normalize_phone(phone),
+            website=website,
+            data_source='Selenium Google Maps'
+        )
+    
+    def _card_address(self, card) -> str:
+        """Address from the "category · address" text line of a result card, empty if it has none"""
+        # Innermost text lines of the card: rating, "category · address", "hours · phone"
+        for line in card.xpath('.//div[contains(@class, "W4Efsd")][not(.//div[contains(@class, "W4Efsd")])]'):
+            # The rating line holds the star image and the hours line the phone number
+            if line.xpath('.//span[@role="img"] | .//span[contains(@class, "UsdlK")]'):
+                continue
+            
+            parts = [part.strip() for part in line.text_content().split('·')]
+            if len(parts) > 1:
+                return next((part for part in parts[1:] if part), '')
         
-        return None
+        return ''
     
-    def scrape_osm_enhanced(self, city: str, business_type: str) -> List[Dict]:
+    def scrape_osm_enhanced(self, city: str, business_type: str) -> List[Business]:
         """Enhanced OpenStreetMap scraping with better queries"""
-        businesses = []
-        
-        # Multiple query strategies for better coverage
-        queries = self._get_osm_queries(business_type)
-        
-        for i, query in enumerate(queries):
-            try:
-                print(f"🗺️  OSM query {i+1}/{len(queries)} for {business_type}")
-                
-                response = requests.post(
-                    "https://overpass-api.de/api/interpreter",
-                    data={'data': query},
-                    timeout=60,
-                    headers={'User-Agent': f'TunisiaScraper/1.0 (Query {i+1})'}
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                for element in data.get('elements', []):
-                    business = self._extract_osm_info(element, business_type, city)
-                    if business and self._is_in_city(business, city):
-                        businesses.append(business)
-                
-                print(f"  ✅ Found {len(data.get('elements', []))} elements")
-                
-                # Rate limiting between queries
-                time.sleep(2)
-                
-            except Exception as e:
-                print(f"  ❌ OSM query {i+1} error: {e}")
-                time.sleep(5)  # Longer delay on error
-        
-        # Remove duplicates
-        businesses = self._remove_duplicates(businesses)
-        print(f"✅ Found {len(businesses)} unique {business_type} via OSM")
-        
-        return businesses
+        return self._run(self._run_source(self._async_osm, city, business_type))
     
     def _get_osm_queries(self, business_type: str) -> List[str]:
-        """Get multiple OSM queries for better coverage"""
+        """Get the OSM query for a business type, every tag filter in one union"""
         base_query = """
-        [out:json][timeout:60];
+        [out:json][timeout:120];
         (
           {node_queries}
         );
         out center meta;
         """
         
-        if business_type == 'doctors':
-            node_queries = [
-                'node["amenity"="doctors"]["name"]["addr:country"="TN"];',
-                'node["healthcare"="doctor"]["name"]["addr:country"="TN"];',
-                'node["healthcare"="clinic"]["name"]["addr:country"="TN"];',
-                'node["healthcare"="hospital"]["name"]["addr:country"="TN"];',
-                'node["office"="doctor"]["name"]["addr:country"="TN"];',
-                'node["office"="medical"]["name"]["addr:country"="TN"];'
-            ]
-        elif business_type == 'jewelry':
-            node_queries = [
-                'node["shop"="jewelry"]["name"]["addr:country"="TN"];',
-                'node["shop"="watches"]["name"]["addr:country"="TN"];',
-                'node["shop"="gold"]["name"]["addr:country"="TN"];',
-                'node["craft"="jeweller"]["name"]["addr:country"="TN"];'
-            ]
-        elif business_type == 'lawyers':
-            node_queries = [
-                'node["office"="lawyer"]["name"]["addr:country"="TN"];',
-                'node["office"="attorney"]["name"]["addr:country"="TN"];',
-                'node["office"="legal_services"]["name"]["addr:country"="TN"];',
-                'node["office"="notary"]["name"]["addr:country"="TN"];'
-            ]
-        else:
+        node_queries = self._plans.get(business_type, _EMPTY_PLAN).osm_filters
+        if not node_queries:
             return []
         
-        # Create multiple queries with different combinations
-        queries = []
-        for i in range(0, len(node_queries), 2):
-            query_nodes = node_queries[i:i+2]
-            query = base_query.format(node_queries='\n'.join(query_nodes))
-            queries.append(query)
-        
-        return queries
+        # Overpass unions any number of filters, so a single round-trip covers them all
+        return [base_query.format(node_queries='\n          '.join(node_queries))]
     
     def scrape_all_sources_enhanced(self, city: str, business_types: List[str]) -> pd.DataFrame:
         """Enhanced scraping from all sources with maximum results"""
-        all_businesses = []
+        print(f"\n🚀 SUPERCHARGED SCRAPING: {', '.join(business_types)} in {city}")
+        print("=" * 60)
+        
+        batches = self._run(self._async_scrape_city(city, business_types))
+        
+        # One frame per source batch, concatenated once and deduplicated once
+        frames: List[pd.DataFrame] = [
+            pd.DataFrame.from_records([asdict(business) for business in batch]) for batch in batches if batch
+        ]
+        if not frames:
+            print(f"\n🎉 TOTAL UNIQUE BUSINESSES: 0")
+            return pd.DataFrame()
+        df = pd.concat(frames, ignore_index=True)
         
+        counts = df['business_type'].value_counts()
         for business_type in business_types:
-            print(f"\n🚀 SUPERCHARGED SCRAPING: {business_type} in {city}")
-            print("=" * 60)
-            
-            # 1. Google Places API (if available)
-            if self.google_api_key:
-                google_results = self.scrape_google_places_enhanced(city, business_type)
-                all_businesses.extend(google_results)
+            print(f"📊 {business_type}: {counts.get(business_type, 0)} total results")
+        
+        # Remove duplicates
+        df = self._remove_duplicates(df)
+        
+        print(f"\n🎉 TOTAL UNIQUE BUSINESSES: {len(df)}")
+        
+        return df
+    
+    def _run(self, coroutine):
+        """Run a coroutine to completion from synchronous code"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        # Called from inside a running event loop (e.g. a notebook), where
+        # asyncio.run is not allowed: run the pipeline on a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    def _client_session(self) -> aiohttp.ClientSession:
+        """Pooled aiohttp session for one run"""
+        return aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=32), headers=self.headers)
+    
+    async def _run_source(self, source, city: str, business_type: str) -> List[Business]:
+        """Run a single async source for one business type in its own session"""
+        async with self._client_session() as session:
+            return await source(session, HostLimits.create(), city, business_type)
+    
+    async def _async_scrape_city(self, city: str, business_types: List[str]) -> List[List[Business]]:
+        """Run every source for every business type concurrently, one result batch per task"""
+        limits = HostLimits.create()
+        async with self._client_session() as session:
+            tasks = []
+            for business_type in business_types:
+                tasks.append(self._async_google_places(session, limits, city, business_type))
+                tasks.append(self._async_osm(session, limits, city, business_type))
+                tasks.append(self._async_serpapi(session, limits, city, business_type))
             
-            # 2. Selenium Google Maps (if enabled)
+            # Selenium is blocking, so it runs in a worker thread alongside the HTTP calls
             if self.use_selenium:
-                selenium_results = self.scrape_google_maps_selenium(city, business_type)
-                all_businesses.extend(selenium_results)
-            
-            # 3. Enhanced OpenStreetMap
-            osm_results = self.scrape_osm_enhanced(city, business_type)
-            all_businesses.extend(osm_results)
+                loop = asyncio.get_running_loop()
+                tasks.append(loop.run_in_executor(None, self._scrape_selenium_all, city, business_types))
             
-            # 4. SerpApi (if available)
-            if self.serpapi_key:
-                serpapi_results = self.scrape_serpapi_enhanced(city, business_type)
-                all_businesses.extend(serpapi_results)
-            
-            print(f"📊 {business_type}: {len([b for b in all_businesses if b.get('business_type') == business_type])} total results")
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # A failing source or business type must not discard the others' results
+        batches = []
+        for result in results:
+            if isinstance(result, Exception):
+                print(f"❌ Source error: {result}")
+            else:
+                batches.append(result)
+        
+        return batches
+    
+    def _scrape_selenium_all(self, city: str, business_types: List[str]) -> List[Business]:
+        """Run the Selenium scraper for each business type in turn"""
+        businesses = []
+        for business_type in business_types:
+            businesses.extend(self.scrape_google_maps_selenium(city, business_type))
+        return businesses
+    
+    @retry_transient
+    async def _afetch_json(self, session, url: str, params: Dict, method: str = 'GET', timeout: int = 30) -> Dict:
+        """Fetch a URL with aiohttp and decode the JSON body"""
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+        if method == 'POST':
+            request = session.post(url, data=params, timeout=client_timeout)
+        else:
+            request = session.get(url, params=params, timeout=client_timeout)
+        
+        async with request as response:
+            response.raise_for_status()
+            return json_loads(await response.read())
+    
+    async def _async_google_places(self, session, limits: HostLimits, city: str, business_type: str) -> List[Business]:
+        """Async Google Places scraping, all search terms in flight at once"""
+        if not self.google_api_key:
+            return []
+        
+        queries = self._build_google_queries(city, business_type)
+        print(f"🔍 Google Places: {len(queries)} searches for {business_type}")
+        
+        async def fetch(url, params):
+            async with limits.google:
+                try:
+                    data = await self._afetch_json(session, url, params)
+                except Exception as e:
+                    print(f"    ❌ Error: {e}")
+                    return []
+                finally:
+                    await asyncio.sleep(0.2)  # Rate limiting
             
-            # Rate limiting between business types
-            time.sleep(3)
+            if data.get('status') != 'OK':
+                return []
+            places = (self._extract_google_place_info(place, business_type, city) for place in data.get('results', []))
+            return [business for business in places if business]
         
-        # Remove duplicates
-        unique_businesses = self._remove_duplicates(all_businesses)
+        batches = await asyncio.gather(*[fetch(url, params) for url, params in queries])
+        businesses = [business for batch in batches for business in batch]
+        print(f"✅ Found {len(businesses)} {business_type} via Google Places")
+        
+        return businesses
+    
+    async def _async_osm(self, session, limits: HostLimits, city: str, business_type: str) -> List[Business]:
+        """Async OpenStreetMap scraping"""
+        queries = self._get_osm_queries(business_type)
+        aliases = self._city_aliases(city)
         
-        print(f"\n🎉 TOTAL UNIQUE BUSINESSES: {len(unique_businesses)}")
+        async def fetch(i, query):
+            async with limits.overpass:
+                print(f"🗺️  OSM query {i+1}/{len(queries)} for {business_type}")
+                try:
+                    data = await self._afetch_json(
+                        session, "https://overpass-api.de/api/interpreter", {'data': query}, method='POST', timeout=150
+                    )
+                except Exception as e:
+                    print(f"  ❌ OSM query {i+1} error: {e}")
+                    return []
+            
+            elements = data.get('elements', [])
+            print(f"  ✅ Found {len(elements)} elements")
+            found = (self._extract_osm_info(element, business_type, city) for element in elements)
+            return [business for business in found if business and self._is_in_city(business, aliases)]
+        
+        batches = await asyncio.gather(*[fetch(i, query) for i, query in enumerate(queries)])
+        businesses = [business for batch in batches for business in batch]
+        print(f"✅ Found {len(businesses)} {business_type} via OSM")
         
-        return pd.DataFrame(unique_businesses)
+        return businesses
     
-    def scrape_serpapi_enhanced(self, city: str, business_type: str) -> List[Dict]:
-        """Enhanced SerpApi scraping"""
+    async def _async_serpapi(self, session, limits: HostLimits, city: str, business_type: str) -> List[Business]:
+        """Async SerpApi scraping"""
         if not self.serpapi_key:
             return []
         
-        businesses = []
-        search_terms = self.business_types.get(business_type, {}).get('search_terms', [])
+        search_terms = self._plans.get(business_type, _EMPTY_PLAN).serpapi_terms
         
-        for search_term in search_terms[:3]:  # Limit to 3 searches
-            query = f"{search_term} in {city} Tunisia"
-            
-            url = "https://serpapi.com/search"
+        async def fetch(query):
             params = {
                 'engine': 'google_maps',
                 'q': query,
                 'api_key': self.serpapi_key,
                 'type': 'search'
             }
-            
-            try:
+            async with limits.serpapi:
                 print(f"🔍 SerpApi: '{query}'")
-                response = requests.get(url, params=params, timeout=30)
-                response.raise_for_status()
-                data = response.json()
-                
-                for result in data.get('local_results', []):
-                    business = self._extract_serpapi_info(result, business_type, city)
-                    if business:
-                        businesses.append(business)
-                
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"❌ SerpApi error: {e}")
+                try:
+                    data = await self._afetch_json(session, "https://serpapi.com/search", params)
+                except Exception as e:
+                    print(f"❌ SerpApi error: {e}")
+                    return []
+                finally:
+                    await asyncio.sleep(1)  # Rate limiting
+            
+            results = (self._extract_serpapi_info(result, business_type, city) for result in data.get('local_results', []))
+            return [business for business in results if business]
         
-        return businesses
+        batches = await asyncio.gather(*[fetch(f"{search_term} in {city} Tunisia") for search_term in search_terms])
+        
+        return [business for batch in batches for business in batch]
+    
+    def scrape_serpapi_enhanced(self, city: str, business_type: str) -> List[Business]:
+        """Enhanced SerpApi scraping"""
+        return self._run(self._run_source(self._async_serpapi, city, business_type))
     
-    def _extract_google_place_info(self, place: Dict, business_type: str, city: str) -> Dict:
+    def _extract_google_place_info(self, place: Dict, business_type: str, city: str) -> Optional[Business]:
         """Extract business information from Google Places API response"""
-        try:
-            return {
-                'name': place.get('name', ''),
-                'business_type': business_type,
-                'address': place.get('formatted_address', ''),
-                'city': city,
-                'region': 'Tunisia',
-                'phone': '',  # Would need place details API call
-                'email': '',
-                'website': '',
-                'latitude': place['geometry']['location']['lat'],
-                'longitude': place['geometry']['location']['lng'],
-                'rating': place.get('rating', ''),
-                'user_ratings_total': place.get('user_ratings_total', ''),
-                'data_source': 'Google Places API'
-            }
-        except Exception as e:
+        name = place.get('name')
+        if not name:
             return None
+        
+        location = (place.get('geometry') or {}).get('location') or {}
+        
+        # Phone and website would need a Place Details API call
+        return Business(
+            name=name,
+            business_type=business_type,
+            address=place.get('formatted_address', ''),
+            city=city,
+            region='Tunisia',
+            latitude=location.get('lat'),
+            longitude=location.get('lng'),
+            rating=place.get('rating'),
+            user_ratings_total=place.get('user_ratings_total'),
+            data_source='Google Places API'
+        )
     
-    def _extract_serpapi_info(self, result: Dict, business_type: str, city: str) -> Dict:
+    def _extract_serpapi_info(self, result: Dict, business_type: str, city: str) -> Optional[Business]:
         """Extract business information from SerpApi response"""
-        try:
-            return {
-                'name': result.get('title', ''),
-                'business_type': business_type,
-                'address': result.get('address', ''),
-                'city': city,
-                'region': 'Tunisia',
-                'phone': result.get('phone', ''),
-                'website': result.get('website', ''),
-                'latitude': result.get('gps_coordinates', {}).get('latitude', ''),
-                'longitude': result.get('gps_coordinates', {}).get('longitude', ''),
-                'rating': result.get('rating', ''),
-                'data_source': 'SerpApi'
-            }
-        except Exception as e:
+        name = result.get('title')
+        if not name:
             return None
+        
+        gps = result.get('gps_coordinates') or {}
+        
+        return Business(
+            name=name,
+            business_type=business_type,
+            address=result.get('address', ''),
+            city=city,
+            region='Tunisia',
+            phone=_normalize_phone(result.get('phone', '')),
+            website=result.get('website', ''),
+            latitude=gps.get('latitude'),
+            longitude=gps.get('longitude'),
+            rating=result.get('rating'),
+            data_source='SerpApi'
+        )
     
-    def _extract_osm_info(self, element: Dict, business_type: str, city: str) -> Dict:
+    def _extract_osm_info(self, element: Dict, business_type: str, city: str) -> Optional[Business]:
         """Extract business information from OSM element"""
-        try:
-            tags = element.get('tags', {})
-            
-            # Get coordinates
-            lat, lon = None, None
-            if element['type'] == 'node':
-                lat, lon = element.get('lat'), element.get('lon')
-            elif 'center' in element:
-                lat, lon = element['center'].get('lat'), element['center'].get('lon')
-            
-            return {
-                'name': tags.get('name', ''),
-                'business_type': business_type,
-                'address': f"{tags.get('addr:street', '')}, {tags.get('addr:city', '')}".strip(', '),
-                'city': tags.get('addr:city', ''),
-                'region': tags.get('addr:state', ''),
-                'phone': tags.get('phone', ''),
-                'email': tags.get('email', ''),
-                'website': tags.get('website', ''),
-                'latitude': lat,
-                'longitude': lon,
-                'data_source': 'OpenStreetMap'
-            }
-        except Exception as e:
-            return None
+        tags = element.get('tags') or {}
+        name = tags.get('name')
+        if not name:
+            return None  # unnamed features are useless as leads, skip building the row
+        
+        # Nodes carry their own coordinates, ways and relations a computed center
+        if element.get('type') == 'node':
+            lat, lon = element.get('lat'), element.get('lon')
+        else:
+            center = element.get('center') or {}
+            lat, lon = center.get('lat'), center.get('lon')
+        
+        return Business(
+            name=name,
+            business_type=business_type,
+            address=', '.join(filter(None, [tags.get('addr:street'), tags.get('addr:city')])),
+            city=tags.get('addr:city', ''),
+            region=tags.get('addr:state', ''),
+            phone=_normalize_phone(tags.get('phone', '')),
+            email=tags.get('email', ''),
+            website=tags.get('website', ''),
+            latitude=lat,
+            longitude=lon,
+            data_source='OpenStreetMap'
+        )
+    
+    def _city_aliases(self, city: str) -> frozenset:
+        """Lowercased names a business city may go by (French, Arabic, districts)"""
+        search_terms = self.tunisia_cities.get(city, {}).get('search_terms', [])
+        return frozenset(name.lower() for name in [city] + search_terms)
     
-    def _is_in_city(self, business: Dict, target_city: str) -> bool:
+    def _is_in_city(self, business: Business, target_city_aliases: frozenset) -> bool:
         """Check if business is in the target city"""
-        business_city = business.get('city', '').lower()
-        target_city_lower = target_city.lower()
-        
-        return (target_city_lower in business_city or 
-                business_city in target_city_lower or
-                target_city_lower == business_city)
-    
-    def _remove_duplicates(self, businesses: List[Dict]) -> List[Dict]:
-        """Remove duplicate businesses"""
-        seen = set()
-        unique = []
-        
-        for business in businesses:
-            key = (
-                business.get('name', '').lower().strip(),
-                round(business.get('latitude', 0), 4) if business.get('latitude') else 0,
-                round(business.get('longitude', 0), 4) if business.get('longitude') else 0
-            )
-            
-            if key not in seen:
-                seen.add(key)
-                unique.append(business)
+        return business.city.lower() in target_city_aliases
+    
+    def _remove_duplicates(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Remove duplicate businesses (same name at the same rounded coordinates)
         
-        return unique
+        A row without coordinates only survives if no row with coordinates shares its name.
+        """
+        if df.empty:
+            return df
+        
+        df = df.copy()
+        keys = ['_name_key', '_lat_r', '_lon_r']
+        df['_name_key'] = df['name'].fillna('').str.lower().str.strip()
+        df['_lat_r'] = pd.to_numeric(df['latitude'], errors='coerce').round(4).fillna(0)
+        df['_lon_r'] = pd.to_numeric(df['longitude'], errors='coerce').round(4).fillna(0)
+        
+        # Coord-less hits (Selenium, some SerpApi) fall back to a name-only match
+        has_coords = (df['_lat_r'] != 0) | (df['_lon_r'] != 0)
+        df = df[has_coords | ~df['_name_key'].isin(df.loc[has_coords, '_name_key'])]
+        
+        return df.drop_duplicates(subset=keys, keep='first').drop(columns=keys).reset_index(drop=True)
     
     def save_to_csv(self, df: pd.DataFrame, filename: str = None) -> str:
         """Save DataFrame to CSV file"""
@@ -577,7 +711,7 @@ class TunisiaBusinessScraperV3:
             timestamp = time.strftime("%Y%m%d_%H%M%S")
             filename = f"tunisia_businesses_v3_{timestamp}.csv"
         
-        df.to_csv(filename, index=False, encoding='utf-8')
+        write_csv(df, filename)
         print(f"💾 Data saved to {filename}")
         return filename
     
@@ -589,17 +723,31 @@ class TunisiaBusinessScraperV3:
         
         print(f"\n📊 === SUPERCHARGED RESULTS ===")
         print(f"🎯 Total businesses: {len(df)}")
+        
+        # One grouping pass over just the summary columns, then cheap roll-ups per level
+        summary_cols = ['business_type', 'data_source', 'city']
+        agg = df[summary_cols].groupby(summary_cols, sort=False, observed=True, dropna=False).size()
+        
+        def counts(level: str) -> pd.Series:
+            return agg.groupby(level=level).sum().sort_values(ascending=False).rename('count')
+        
         print(f"\n🏢 Business types:")
-        print(df['business_type'].value_counts())
+        print(counts('business_type'))
         print(f"\n📡 Data sources:")
-        print(df['data_source'].value_counts())
+        print(counts('data_source'))
         print(f"\n🏙️  Cities:")
-        print(df['city'].value_counts().head(10))
+        print(counts('city').head(10))
         
         print(f"\n📋 === FIRST 10 ROWS ===")
         display_cols = ['name', 'business_type', 'address', 'phone', 'city', 'data_source']
         available_cols = [col for col in display_cols if col in df.columns]
         print(df[available_cols].head(10).to_string(index=False))
+    
+    def close(self):
+        """Quit the shared Chrome driver"""
+        if self._driver is not None:
+            self._driver.quit()
+            self._driver = None
 
 
 def main():
@@ -646,17 +794,20 @@ def main():
     print(f"\n🚀 SUPERCHARGED SCRAPING for {business_types} in {city}...")
     print("This may take a few minutes to get maximum results...")
     
-    df = scraper.scrape_all_sources_enhanced(city, business_types)
-    
-    if not df.empty:
-        # Save and display results
-        filename = scraper.save_to_csv(df)
-        scraper.display_summary(df)
-        print(f"\n🎉 SUPERCHARGED SCRAPING COMPLETED!")
-        print(f"📁 Data saved to: {filename}")
-        print(f"📊 Total results: {len(df)}")
-    else:
-        print("❌ No businesses found. Try a different city or check your setup.")
+    try:
+        df = scraper.scrape_all_sources_enhanced(city, business_types)
+        
+        if not df.empty:
+            # Save and display results
+            filename = scraper.save_to_csv(df)
+            scraper.display_summary(df)
+            print(f"\n🎉 SUPERCHARGED SCRAPING COMPLETED!")
+            print(f"📁 Data saved to: {filename}")
+            print(f"📊 Total results: {len(df)}")
+        else:
+            print("❌ No businesses found. Try a different city or check your setup.")
+    finally:
+        scraper.close()
 
 
 if __name__ == "__main__":